@@ -77,6 +77,12 @@ def add_actions_to_parser(parser):
     parser.add_argument(
         '--force', action='store_true',
         help='Write to destination path even if it already exists')
+    parser.add_argument(
+        '--no-dependencies', action='store_true',
+        help='Do not include object dependencies in generated files')
+    parser.add_argument(
+        '-j', '--jobs', action='store', type=int, default=1,
+        help='Number of processes to use when generating the project')
     parser.add_argument(
         '--gitkeep', action='store_true',
         help='Create a .gitkeep file in empty directories')
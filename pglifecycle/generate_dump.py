@@ -3,24 +3,165 @@
 Generates a pg_dump compatible build artifact
 
 """
+import collections
+from concurrent import futures
 import csv
 import dataclasses
+import hashlib
 import logging
+import os
 import pathlib
+import pickle
+import sys
 import typing
 
 import pgdumplib
 import pgdumplib.dump as dump
 import ruamel.yaml as yaml
-import toposort
 
-from pglifecycle import constants, parse, utils
+from pglifecycle import constants, parse, utils, version
 
 LOGGER = logging.getLogger(__name__)
 
+_YAML = yaml.YAML(typ='safe')
+_YAML_SUFFIXES = ('.yaml', '.yml')
+
+# Object types that are not read into the inventory by _create_inventory
+_NON_INVENTORY_TYPES = frozenset({
+    constants.ACL,
+    constants.GROUP,
+    constants.FOREIGN_DATA_WRAPPER,
+    constants.ROLE,
+    constants.SCHEMA,
+    constants.SERVER,
+    constants.TYPE,
+    constants.USER,
+    constants.USER_MAPPING})
+
+# Schema to use for entries with an empty schema, keyed by object type
+_EMPTY_SCHEMAS = {obj_type: obj_type for obj_type in (
+    constants.EXTENSION,
+    constants.FOREIGN_DATA_WRAPPER,
+    constants.PROCEDURAL_LANGUAGE,
+    constants.SCHEMA,
+    constants.SERVER)}
+
+# Inventory schemas that stand in for the empty namespace of the dump entry
+_TYPE_SCHEMAS = frozenset({
+    constants.EXTENSION,
+    constants.FOREIGN_DATA_WRAPPER,
+    constants.GROUP,
+    constants.PROCEDURAL_LANGUAGE,
+    constants.ROLE,
+    constants.SCHEMA,
+    constants.SERVER,
+    constants.USER,
+    constants.USER_MAPPING})
+
+_ROLE_TYPES = frozenset({constants.GROUP, constants.ROLE, constants.USER})
+
+_TABLE_KEYS = tuple(constants.TABLE_KEYS.items())
+
+# Bump when the layout of the parse cache or the values it stores change
+_CACHE_FORMAT = 2
+
+
+def _cache_file(project_path: pathlib.Path) -> pathlib.Path:
+    """Return the path of the parsed YAML cache for the project. The cache
+    lives in the user's cache directory instead of the project so that a
+    pickle is never loaded from a checked out repository.
+
+    """
+    base_path = os.environ.get('XDG_CACHE_HOME') or \
+        os.path.join(os.path.expanduser('~'), '.cache')
+    digest = hashlib.sha1(
+        str(project_path.resolve()).encode('utf-8')).hexdigest()
+    return pathlib.Path(base_path) / 'pglifecycle' / '{}.pickle'.format(
+        digest)
+
+
+def _options_sql(options: dict) -> str:
+    """Return the OPTIONS clause for a FDW, server, or user mapping"""
+    return 'OPTIONS ({})'.format(', '.join(
+        "{} '{}'".format(k, v) for k, v in options.items()))
+
+
+def _cache_fingerprint() -> str:
+    """Return the fingerprint of the cache format and the loader that
+    produced the cached values, so a cache written by a different package,
+    YAML library, or Python version is ignored.
+
+    """
+    return hashlib.sha1(repr((
+        _CACHE_FORMAT, version, yaml.__version__,
+        sys.version_info[:2])).encode('utf-8')).hexdigest()
+
+
+def _intern(value: typing.Optional[str]) -> typing.Optional[str]:
+    """Intern schema and object names used in inventory keys"""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def _load_yaml(path: str) -> dict:
+    """Parse the YAML file at the specified path, used directly and as the
+    process pool worker when parsing in parallel.
+
+    """
+    with open(path, 'rb') as handle:
+        return _YAML.load(handle)
+
+
+def _toposort(dependencies: typing.Dict[int, typing.Set[int]]) \
+        -> typing.Tuple[typing.List[int], typing.Set[int]]:
+    """Return the items in dependency order using Kahn's algorithm. Items
+    are emitted level by level with each level sorted, matching the order
+    of toposort.toposort_flatten. Dependencies that are not keys are
+    treated as items without dependencies of their own.
+
+    Items that could not be ordered are returned as the second value,
+    trimmed down to the ones that are part of, or sit between, cycles.
+
+    """
+    dependents, in_degree = {}, {}
+    for item, deps in dependencies.items():
+        in_degree.setdefault(item, 0)
+        for dep in deps:
+            if dep == item:
+                continue
+            in_degree.setdefault(dep, 0)
+            in_degree[item] += 1
+            dependents.setdefault(dep, []).append(item)
+    order = []
+    level = sorted(item for item, count in in_degree.items() if not count)
+    while level:
+        order.extend(level)
+        ready = []
+        for item in level:
+            for dependent in dependents.get(item, []):
+                in_degree[dependent] -= 1
+                if not in_degree[dependent]:
+                    ready.append(dependent)
+        level = sorted(ready)
+    cyclic = {item for item, count in in_degree.items() if count}
+    out_degree = {item: sum(1 for dependent in dependents.get(item, [])
+                            if dependent in cyclic) for item in cyclic}
+    trim = [item for item, count in out_degree.items() if not count]
+    while trim:
+        item = trim.pop()
+        cyclic.discard(item)
+        for dep in dependencies[item]:
+            if dep in cyclic and dep != item:
+                out_degree[dep] -= 1
+                if not out_degree[dep]:
+                    trim.append(dep)
+    return order, cyclic
+
 
 @dataclasses.dataclass
 class _Item:
+    obj_type: str
+    schema: str
+    name: str
     dump_id: int
     definition: typing.Optional[dict] = None
     parent: typing.Optional[int] = None
@@ -37,24 +178,54 @@ class _Project:
 
 
 class Generate:
-    """Generate Project Structure"""
+    """Generate Project Structure
+
+    Parsed YAML is only cached between runs when ``cache`` is set in the
+    arguments. Setting ``verify`` checks that each object's dependencies
+    were added to the dump before it. ``jobs`` sets the number of processes
+    used to parse the project files. These are API-only switches, they are
+    not exposed as command line options.
+
+    """
 
     def __init__(self, args):
         self._acls = {}
         self._args = args
+        self._cache = {}
+        self._cache_changed = False
+        self._debug = False
         self._dependencies = {}
-        self._dump_id = None
-        self._first_avail_id = None
+        self._executor = None
         self._inventory = {}
+        self._inventory_by_type = collections.defaultdict(dict)
         self._objects = 0
         self._processed = set({})
         self._project_path = pathlib.Path(args.project)
+        self._cache_path = _cache_file(self._project_path)
+        self._use_cache = getattr(args, 'cache', False)
+        self._verify = getattr(args, 'verify', False)
+        self._cached = self._load_cache() if self._use_cache else {}
         self._project = self._read_project_file()
         self._reverse_lookup = {}
+        self._role_entries = {}
+        self._schema_dump_ids = {}
+        self._sequences_by_owner = {}
         self._dump = pgdumplib.new(self._project.name, self._project.encoding)
+        self._dump_id = max((e.dump_id for e in self._dump.entries), default=0)
 
     def run(self):
         """Generate the pg_dump compatible artifact from the project"""
+        self._debug = LOGGER.isEnabledFor(logging.DEBUG)
+        jobs = getattr(self._args, 'jobs', 1)
+        if jobs > 1:
+            self._executor = futures.ProcessPoolExecutor(jobs)
+        try:
+            self._run()
+        finally:
+            if self._executor:
+                self._executor.shutdown()
+
+    def _run(self):
         LOGGER.info('Pre-processing items')
         self._process_schemas()
         self._process_extensions()
@@ -87,47 +258,41 @@ class Generate:
                     len(self._dump.entries))
         self._save_dump()
 
+    def _add_entry(self, *args, **kwargs) -> dump.Entry:
+        """Add an entry with the next dump_id to the dump and count it as
+        a processed object.
+
+        """
+        entry = self._dump.add_entry(
+            *args, dump_id=self._next_dump_id(), **kwargs)
+        self._processed.add(entry.dump_id)
+        self._objects += 1
+        return entry
+
     def _add_generic_item(self, desc: str, schema: str, name: str, sql: str,
                           owner: typing.Optional[str] = None) -> dump.Entry:
-        entry = self._dump.add_entry(
+        entry = self._add_entry(
             desc=desc,
-            dump_id=self._next_dump_id(),
             tag=name,
             namespace=schema,
             owner=owner or self._project.superuser,
             defn=sql)
-        self._processed.add(entry.dump_id)
-        if desc not in self._inventory:
-            self._inventory[desc] = {}
         schema = self._maybe_replace_schema(schema, desc)
-        if schema not in self._inventory[desc]:
-            self._inventory[desc][schema] = {}
-        self._inventory[desc][schema][name] = _Item(entry.dump_id)
-        self._reverse_lookup[entry.dump_id] = desc, schema, name
-        LOGGER.debug('Added %s %s.%s: %r', desc, schema, name,
-                     self._inventory[desc][schema][name])
-        self._objects += 1
+        self._store_item(_Item(desc, schema, name, entry.dump_id))
         return entry
 
     def _add_item(self, obj_type: str, schema: str, name: str,
                   definition: typing.Optional[dict] = None,
-                  parent: typing.Optional[int] = None) -> typing.NoReturn:
+                  parent: typing.Optional[int] = None) -> _Item:
         # Prefer, but don't require, a specified value in the definition
         if definition:
             schema = definition.get('schema', schema)
             name = definition.get('name', name)
         schema = self._maybe_replace_schema(schema, obj_type)
-        if obj_type not in self._inventory:
-            self._inventory[obj_type] = {}
-        if schema not in self._inventory[obj_type]:
-            self._inventory[obj_type][schema] = {}
-        dump_id = self._next_dump_id()
-        self._inventory[obj_type][schema][name] = _Item(
-            dump_id, definition, parent)
-        self._reverse_lookup[dump_id] = obj_type, schema, name
+        item = self._store_item(_Item(
+            obj_type, schema, name, self._next_dump_id(), definition, parent))
         self._objects += 1
-        LOGGER.debug('Added %s %s.%s: %r', obj_type, schema, name,
-                     self._inventory[obj_type][schema][name])
+        return item
 
     def _build_acls_for_object(self, entry: pgdumplib.dump.Entry) \
             -> typing.Tuple[list, str]:
@@ -144,13 +309,10 @@ class Generate:
             'REVOKE ALL ON {} FROM PUBLIC;'.format(name),
             'REVOKE ALL ON {} FROM {};'.format(name, self._project.superuser)
         ]
-        for role_name in sorted(self._acls[entry.dump_id].keys()):
+        grant_weight = constants.GRANT_SORT_WEIGHTS.__getitem__
+        for role_name, perms in sorted(self._acls[entry.dump_id].items()):
             sql.append('GRANT {} ON {} TO {};'.format(
-                ', '.join(
-                    sorted(
-                        self._acls[entry.dump_id][role_name],
-                        key=lambda k: constants.GRANT_SORT_WEIGHTS[k])),
-                name, role_name))
+                ', '.join(sorted(perms, key=grant_weight)), name, role_name))
             if not self._system_role(role_name):
                 dependency = self._lookup_role_entry(role_name)
                 if dependency:
@@ -173,23 +335,16 @@ class Generate:
     def _create_inventory(self) -> typing.NoReturn:
         counter = 0
         for obj_type in constants.PATHS:
-            if obj_type in [constants.ACL,
-                            constants.GROUP,
-                            constants.FOREIGN_DATA_WRAPPER,
-                            constants.ROLE,
-                            constants.SCHEMA,
-                            constants.SERVER,
-                            constants.TYPE,
-                            constants.USER,
-                            constants.USER_MAPPING]:
+            if obj_type in _NON_INVENTORY_TYPES:
                 continue
             for schema, name, definition in self._iterate_files(obj_type):
-                self._add_item(obj_type, schema, name, definition)
+                item = self._add_item(obj_type, schema, name, definition)
                 counter += 1
                 if obj_type == constants.TABLE:
-                    LOGGER.debug('%r, %r, %r', obj_type, schema, name)
-                    dump_id = self._inventory[obj_type][schema][name].dump_id
-                    for c_obj_type, key in constants.TABLE_KEYS.items():
+                    if self._debug:
+                        LOGGER.debug('%r, %r, %r', obj_type, schema, name)
+                    dump_id = item.dump_id
+                    for c_obj_type, key in _TABLE_KEYS:
                         for child in definition.get(key, []):
                             self._add_item(
                                 c_obj_type, schema, child['name'],
@@ -197,39 +352,46 @@ class Generate:
                             counter += 1
 
         for desc in [constants.GROUP, constants.ROLE, constants.USER]:
-            self._inventory[desc] = {desc: {}}
             for name, _ignore, definition in self._iterate_files(desc):
                 dump_id, dependencies = self._next_dump_id(), set({})
                 for dep_type in [constants.GROUP, constants.ROLE]:
                     for key in ['grants', 'revocations']:
                         for dep in definition.get(key, {}).get(
                                 '{}s'.format(dep_type.lower()), []):
-                            dependencies.add(':'.join([dep_type, dep]))
-                definition['dependencies'] = list(dependencies)
-                self._inventory[desc][desc][name] = _Item(dump_id, definition)
-                self._reverse_lookup[dump_id] = desc, desc, name
+                            dependencies.add((dep_type, dep))
+                definition = dict(
+                    definition, dependencies=list(dependencies))
+                self._store_item(_Item(desc, desc, name, dump_id, definition))
                 self._objects += 1
                 counter += 1
 
         LOGGER.info('Processed %i files', counter)
+        self._index_sequences()
 
     def _find_sequence_for_table(self, schema: str, table: str) \
             -> typing.Optional[typing.Tuple[int, str, str, str]]:
-        for s_schema in self._inventory[constants.SEQUENCE]:
-            for s_name in self._inventory[constants.SEQUENCE][s_schema]:
-                item = self._inventory[constants.SEQUENCE][s_schema][s_name]
-                prefix = '{}.{}.'.format(schema, table)
-                if item.definition.get('owned_by', '').startswith(prefix):
-                    return (item.dump_id,
-                            item.definition['owned_by'].split('.')[2],
-                            item.definition.get('schema', s_schema),
-                            item.definition.get('name', s_name))
+        return self._sequences_by_owner.get((schema, table))
 
     def _get_owner(self, definition):
         if not definition:
             return self._project.superuser
         return definition.get('owner', self._project.superuser)
 
+    def _index_sequences(self) -> typing.NoReturn:
+        """Index the sequences in the inventory by the schema and table
+        that own them, keeping the first sequence found for a table.
+
+        """
+        for item in self._inventory_by_type[constants.SEQUENCE].values():
+            owned_by = item.definition.get('owned_by', '').split('.')
+            if len(owned_by) < 3:
+                continue
+            self._sequences_by_owner.setdefault(
+                (owned_by[0], owned_by[1]),
+                (item.dump_id, owned_by[2],
+                 item.definition.get('schema', item.schema),
+                 item.definition.get('name', item.name)))
+
     def _iterate_files(self, file_type: str) \
             -> typing.Generator[typing.Tuple[str, str, dict], None, None]:
         """Generator that will iterate over all of the subdirectories and
@@ -242,28 +404,25 @@ class Generate:
         if not path.exists():
             LOGGER.warning('No %s file found in project', file_type)
             return
-        for child in sorted(path.iterdir(), key=lambda p: str(p)):
+        files = []
+        for child in self._scandir(path):
             if child.is_dir():
-                for s_child in sorted(child.iterdir(), key=lambda p: str(p)):
-                    if self._is_yaml(s_child):
-                        yield (s_child.parent.name,
-                               s_child.name.split('.')[0],
-                               self._read_file(s_child))
-                    else:
+                for s_child in self._scandir(child.path):
+                    if (s_child.is_file()
+                            and s_child.name.endswith(_YAML_SUFFIXES)):
+                        files.append((sys.intern(child.name),
+                                      sys.intern(s_child.name.split('.')[0]),
+                                      s_child.path))
+                    elif self._debug:
                         LOGGER.debug('Ignoring %r in %s', s_child.name, path)
-            elif self._is_yaml(child):
-                yield (child.name.split('.')[0],
-                       None,
-                       self._read_file(child))
-            else:
+            elif child.is_file() and child.name.endswith(_YAML_SUFFIXES):
+                files.append((sys.intern(child.name.split('.')[0]), None,
+                              child.path))
+            elif self._debug:
                 LOGGER.debug('Ignoring %r in %s', child.name, path)
-
-    @staticmethod
-    def _is_yaml(file_path: pathlib.Path) -> bool:
-        """Returns `True` if the file exists and ends with a YAML extension"""
-        return (file_path.is_file()
-                and (file_path.name.endswith('.yaml')
-                     or file_path.name.endswith('.yml')))
+        for (schema, name, _path), definition in zip(
+                files, self._read_files([f[2] for f in files])):
+            yield schema, name, definition
 
     @staticmethod
     def _lookup_desc_from_grant_key(key):
@@ -273,20 +432,29 @@ class Generate:
 
     def _lookup_entry(self, obj_type: str, schema: str, name: str) -> _Item:
         schema = obj_type if schema == '' else schema
-        LOGGER.debug('Lookup %s %s.%s', obj_type, schema, name)
-        try:
-            return self._inventory[obj_type][schema][name]
-        except KeyError:
-            LOGGER.debug('Could not find %s %s.%s in inventory',
-                         obj_type, schema, name)
+        if self._debug:
+            LOGGER.debug('Lookup %s %s.%s', obj_type, schema, name)
+        item = self._inventory.get((obj_type, schema, name))
+        if item is None:
+            if self._debug:
+                LOGGER.debug('Could not find %s %s.%s in inventory',
+                             obj_type, schema, name)
             raise RuntimeError
+        return item
 
     def _lookup_role_entry(self, name):
+        """Return the group, role, or user with the specified name. Roles
+        are only looked up once the inventory is complete, so found roles
+        are memoized per name.
+
+        """
+        if name in self._role_entries:
+            return self._role_entries[name]
         for desc in [constants.GROUP, constants.ROLE, constants.USER]:
-            try:
-                return self._lookup_entry(desc, '', name)
-            except RuntimeError:
-                pass
+            item = self._inventory.get((desc, desc, name))
+            if item is not None:
+                self._role_entries[name] = item
+                return item
         if not self._args.suppress_warnings:
             LOGGER.warning('No defined role, group, or user named %s', name)
 
@@ -304,7 +472,7 @@ class Generate:
                                     constants.POLICY,
                                     constants.RULE,
                                     constants.TRIGGER]:
-                    parsed = parse.sql(data['sql'])
+                    parsed = parse.cached_sql(data['sql'])[0]
                     sql.append(parsed['name'])
                     sql.append('ON')
                     sql.append(parsed['relation'])
@@ -316,13 +484,13 @@ class Generate:
                 desc=constants.COMMENT,
                 dump_id=self._next_dump_id(),
                 tag='{} {}'.format(entry.desc, entry.tag),
-                defn='{}\n'.format(' '.join(sql)),
+                defn=' '.join(sql) + '\n',
                 owner=entry.owner,
                 dependencies=[entry.dump_id])
             self._objects += 1
         elif 'comments' in data:
             for comment in data['comments']:
-                parsed = parse.sql(comment)
+                parsed = parse.cached_sql(comment)[0]
                 self._dump.add_entry(
                     desc=constants.COMMENT,
                     dump_id=self._next_dump_id(),
@@ -335,21 +503,9 @@ class Generate:
 
     @staticmethod
     def _maybe_replace_schema(schema, obj_type):
-        if schema != '':
-            return schema
-        if obj_type in [constants.EXTENSION,
-                        constants.FOREIGN_DATA_WRAPPER,
-                        constants.PROCEDURAL_LANGUAGE,
-                        constants.SCHEMA,
-                        constants.SERVER]:
-            LOGGER.debug('Overwriting schema for %s', obj_type)
-            return obj_type
-        LOGGER.debug('Returning public schema for %s', obj_type)
-        return 'public'
+        return schema or _EMPTY_SCHEMAS.get(obj_type, 'public')
 
     def _next_dump_id(self) -> int:
-        if self._dump_id is None:
-            self._dump_id = max(e.dump_id for e in self._dump.entries)
         self._dump_id += 1
         return self._dump_id
 
@@ -371,22 +527,19 @@ class Generate:
                     raise RuntimeError
             else:
                 desc = entry.desc
-            if desc in [constants.GROUP, constants.ROLE, constants.USER]:
+            if desc in _ROLE_TYPES:
                 dependencies, sql = self._build_acls_for_role(
                     dump_id, entry.tag if entry else tag)
             else:
                 dependencies, sql = self._build_acls_for_object(entry)
-            acl = self._dump.add_entry(
+            self._add_entry(
                 constants.ACL,
                 entry.namespace if entry else '', entry.tag if entry else tag,
-                defn=sql, dependencies=list(dependencies),
-                dump_id=self._next_dump_id())
-            self._processed.add(acl.dump_id)
-            self._objects += 1
+                defn=sql, dependencies=list(dependencies))
 
     def _process_child(self, ct, cs, cn, dump_id):
-        pt, ps, pn = self._reverse_lookup[self._inventory[ct][cs][cn].parent]
-        parent = self._inventory[pt][ps][pn].definition
+        parent_id = self._inventory[ct, cs, cn].parent
+        parent = self._inventory[self._reverse_lookup[parent_id]].definition
         for item in parent[constants.TABLE_KEYS[ct]]:
             if item['name'] != cn:
                 continue
@@ -405,36 +558,29 @@ class Generate:
 
     def _process_dependencies(self) -> typing.NoReturn:
         LOGGER.info('Processing dependencies')
-        for obj_type in self._inventory:
-            if obj_type in [constants.GROUP,
-                            constants.ROLE,
-                            constants.SCHEMA,
-                            constants.USER]:
+        for obj_type, items in self._inventory_by_type.items():
+            if obj_type == constants.SCHEMA or obj_type in _ROLE_TYPES:
                 continue
-            for schema in self._inventory[obj_type]:
-                for name in self._inventory[obj_type][schema]:
-                    dump_id = self._inventory[obj_type][schema][name].dump_id
-                    self._dependencies[dump_id] = set({})
-                    if self._inventory[obj_type][schema][name].parent:
-                        self._dependencies[dump_id].add(
-                            self._inventory[obj_type][schema][name].parent)
-                    if self._inventory[obj_type][schema][name].definition:
-                        self._process_item_dependencies(
-                            schema, dump_id,
-                            self._inventory[obj_type][schema][name].definition)
+            for item in items.values():
+                self._dependencies[item.dump_id] = set({})
+                if item.parent:
+                    self._dependencies[item.dump_id].add(item.parent)
+                if item.definition:
+                    self._process_item_dependencies(
+                        item.schema, item.dump_id, item.definition)
 
     def _process_dml(self) -> typing.NoReturn:
         path = self._project_path.joinpath(constants.PATHS[constants.DML])
         if not path.exists():
             LOGGER.error('DML at %s not found', path)
             return
-        for schema in sorted(path.iterdir(), key=lambda p: str(p)):
+        for schema in self._scandir(path):
             if not schema.is_dir():
                 continue
-            for table in sorted(schema.iterdir(), key=lambda p: str(p)):
+            for table in self._scandir(schema.path):
                 if not table.name.endswith('.csv'):
                     continue
-                self._process_dml_file(table)
+                self._process_dml_file(pathlib.Path(table.path))
 
     def _process_dml_file(self, path: pathlib.Path):
         schema = path.parent.name
@@ -452,22 +598,25 @@ class Generate:
                 seq_column = fields.index(sequence[1])
             reader = csv.reader(handle)
             with self._dump.table_data_writer(entry, fields) as writer:
-                for row in reader:
-                    writer.append(*row)
-                    if sequence:
-                        if int(row[seq_column]) > max_value:
-                            max_value = int(row[seq_column])
-            self._dump_id = None  # Reset the dump_id to get max from pgdumplib
+                append = writer.append
+                if sequence:
+                    for row in reader:
+                        append(*row)
+                        value = int(row[seq_column])
+                        if value > max_value:
+                            max_value = value
+                else:
+                    for row in reader:
+                        append(*row)
+            # pgdumplib assigns the dump_id for the TABLE DATA entry
+            self._dump_id = max(self._dump_id, writer.dump_id)
             if sequence:
-                acl = self._dump.add_entry(
+                self._add_entry(
                     constants.SEQUENCE_SET,
                     sequence[2], sequence[3],
                     defn='ALTER SEQUENCE {}.{} RESTART WITH {};\n'.format(
                         sequence[2], sequence[3], max_value + 1),
-                    dependencies=[sequence[0]],
-                    dump_id=self._next_dump_id())
-                self._processed.add(acl.dump_id)
-                self._objects += 1
+                    dependencies=[sequence[0]])
 
     def _process_extensions(self) -> typing.NoReturn:
         for extension in self._project.extensions:
@@ -479,7 +628,7 @@ class Generate:
                 sql.append(schema)
             entry = self._add_generic_item(
                 constants.EXTENSION, schema, extension['name'],
-                '{};\n'.format(' '.join(sql)))
+                ' '.join(sql) + ';\n')
             self._maybe_add_comment(entry, extension)
 
     def _process_fdws(self) -> typing.NoReturn:
@@ -501,58 +650,61 @@ class Generate:
                 else:
                     sql.append('NO VALIDATOR')
                 if 'options' in definition:
-                    sql.append('OPTIONS')
-                    sql.append(
-                        '({})'.format(', '.join(
-                            ["{} '{}'".format(k, v)
-                             for k, v in definition['options'].items()])))
+                    sql.append(_options_sql(definition['options']))
             entry = self._add_generic_item(
                 constants.FOREIGN_DATA_WRAPPER, '',
-                definition.get('name', name), '{};\n'.format(' '.join(sql)),
+                definition.get('name', name), ' '.join(sql) + ';\n',
                 definition.get('owner', self._project.superuser))
             self._maybe_add_comment(entry, definition)
-            self._objects += 1
 
     def _process_inventory(self) -> typing.NoReturn:
-        for dump_id in toposort.toposort_flatten(self._dependencies):
-            if dump_id in self._processed:
-                continue
-            obj_type, schema, name = self._reverse_lookup[dump_id]
-            LOGGER.debug('Processing %s %s.%s', obj_type, schema, name)
-            for dep in self._dependencies[dump_id]:
-                if dep not in self._processed:
-                    mt, ms, mn = self._reverse_lookup[dump_id]
-                    LOGGER.error('Dependency for %i (%s, %s, %s), '
-                                 '%i (%s, %s, %s) not processed',
-                                 dump_id, obj_type, schema, name,
-                                 dep, mt, ms, mn)
-                    raise RuntimeError
-            if self._inventory[obj_type][schema][name].parent:
+        add_entry, dependencies = self._dump.add_entry, self._dependencies
+        inventory, processed = self._inventory, self._processed
+        reverse_lookup = self._reverse_lookup
+        superuser = self._project.superuser
+        pending = {dump_id: deps - processed
+                   for dump_id, deps in dependencies.items()
+                   if dump_id not in processed}
+        for dump_id in self._sort_dependencies(pending):
+            obj_type, schema, name = reverse_lookup[dump_id]
+            if self._debug:
+                LOGGER.debug('Processing %s %s.%s', obj_type, schema, name)
+            if self._verify:
+                for dep in dependencies[dump_id]:
+                    if dep not in processed:
+                        mt, ms, mn = reverse_lookup[dep]
+                        LOGGER.error('Dependency for %i (%s, %s, %s), '
+                                     '%i (%s, %s, %s) not processed',
+                                     dump_id, obj_type, schema, name,
+                                     dep, mt, ms, mn)
+                        raise RuntimeError
+            item = inventory[obj_type, schema, name]
+            if item.parent:
                 self._process_child(obj_type, schema, name, dump_id)
                 continue
-            definition = self._inventory[obj_type][schema][name].definition
-            entry = self._dump.add_entry(
-                obj_type, schema, name, self._get_owner(definition),
-                definition['sql'], dependencies=self._dependencies[dump_id],
+            definition = item.definition
+            entry = add_entry(
+                obj_type, schema, name, definition.get('owner', superuser),
+                definition['sql'], dependencies=dependencies[dump_id],
                 tablespace=definition.get('tablespace', ''), dump_id=dump_id)
             self._maybe_add_comment(entry, definition)
-            self._processed.add(dump_id)
+            processed.add(dump_id)
             self._objects += 1
         self._process_sequence_set_owned_by()
 
     def _process_item_dependencies(self, schema: str, dump_id: int,
                                    definition: dict) -> typing.NoReturn:
         if schema != 'public':
-            LOGGER.debug('Adding schema %r as a dependency', schema)
-            try:
-                self._dependencies[dump_id].add(
-                    self._lookup_entry(constants.SCHEMA, '', schema).dump_id)
-            except RuntimeError:
+            if self._debug:
+                LOGGER.debug('Adding schema %r as a dependency', schema)
+            schema_dump_id = self._schema_dump_ids.get(schema)
+            if schema_dump_id is None:
                 LOGGER.error('Failed to lookup SCHEMA %s', schema)
-                raise
+                raise RuntimeError
+            self._dependencies[dump_id].add(schema_dump_id)
 
         for dep in definition.get('dependencies', []):
-            obj_type, name = list(dep.items())[0]
+            obj_type, name = next(iter(dep.items()))
             if '.' in name:
                 d_schema, name = name.split('.')
             elif obj_type == constants.SCHEMA and name in {schema, 'public'}:
@@ -592,7 +744,7 @@ class Generate:
                 sql.append(utils.quote_ident(language['validator']))
             entry = self._add_generic_item(
                 constants.PROCEDURAL_LANGUAGE, '', language['name'],
-                '{};'.format(' '.join(sql)))
+                ' '.join(sql) + ';')
             self._maybe_add_comment(entry, language)
 
     def _process_role_acls(self, dump_id: int,
@@ -600,7 +752,7 @@ class Generate:
         _desc, _schema, role_name = self._reverse_lookup[dump_id]
         for grant_type in grants:
             desc = self._lookup_desc_from_grant_key(grant_type)
-            if desc in [constants.GROUP, constants.ROLE, constants.USER]:
+            if desc in _ROLE_TYPES:
                 for value in grants[grant_type]:
                     try:
                         entry = self._lookup_entry(desc, '', value)
@@ -632,8 +784,9 @@ class Generate:
 
     def _process_role_create(self, dump_id: int,
                              dependencies: dict) -> pgdumplib.dump.Entry:
-        desc, schema, name = self._reverse_lookup[dump_id]
-        definition = self._inventory[desc][schema][name].definition
+        key = self._reverse_lookup[dump_id]
+        desc, _schema, name = key
+        definition = self._inventory[key].definition
         if definition.get('create', True):
             sql = [
                 'CREATE', desc, definition.get('name', name), 'WITH'
@@ -646,7 +799,7 @@ class Generate:
                 sql.append('$${}$$'.format(definition['password']))
             entry = self._dump.add_entry(
                 desc, tag=definition.get('name', name),
-                defn='{};\n'.format(' '.join(sql)),
+                defn=' '.join(sql) + ';\n',
                 dependencies=list(dependencies[dump_id]), dump_id=dump_id)
             self._maybe_add_comment(entry, definition)
             self._processed.add(dump_id)
@@ -654,48 +807,42 @@ class Generate:
             return entry
 
     def _process_role_dependencies(self) -> dict:
-        dependencies = {}
+        dependencies, superuser = {}, self._project.superuser
         for desc in [constants.GROUP, constants.ROLE, constants.USER]:
-            for name in self._inventory[desc][desc]:
-                definition = self._inventory[desc][desc][name].definition
-                dump_id = self._inventory[desc][desc][name].dump_id
+            for item in self._inventory_by_type[desc].values():
+                name, dump_id = item.name, item.dump_id
                 dependencies[dump_id] = set({})
-                for dependency in definition['dependencies']:
-                    dt, dn = dependency.split(':')
-                    if dn == self._project.superuser:
+                for dt, dn in item.definition['dependencies']:
+                    if dn == superuser:
                         continue
-                    try:
-                        dependencies[dump_id].add(
-                            self._lookup_entry(dt, dt, dn).dump_id)
-                    except RuntimeError:
+                    dependency = self._inventory.get((dt, dt, dn))
+                    if dependency is None:
                         LOGGER.error('%s %s has missing dependency: %s %s',
                                      desc, name, dt, dn)
-                        raise
+                        raise RuntimeError
+                    dependencies[dump_id].add(dependency.dump_id)
         return dependencies
 
     def _process_role_drop(self, dump_id: int, dependencies: dict) -> int:
-        desc, schema, name = self._reverse_lookup[dump_id]
-        definition = self._inventory[desc][schema][name].definition
+        key = self._reverse_lookup[dump_id]
+        desc, _schema, name = key
+        definition = self._inventory[key].definition
         if definition.get('create', True):
-            drop_if_exists = self._dump.add_entry(
+            return self._add_entry(
                 desc, tag=definition.get('name', name),
                 defn='DROP {} IF EXISTS {};\n'.format(
-                    desc, self._inventory[desc][schema][name].definition.get(
-                        'name', name)),
-                dependencies=list(dependencies[dump_id]),
-                dump_id=self._next_dump_id())
-            self._processed.add(drop_if_exists.dump_id)
-            self._objects += 1
-            return drop_if_exists.dump_id
+                    desc, definition.get('name', name)),
+                dependencies=list(dependencies[dump_id])).dump_id
 
     def _process_role_settings(self, entry: pgdumplib.dump.Entry,
                                settings: list) -> typing.NoReturn:
         for setting in settings:
             if setting['type'] == 'VALUE':
-                if isinstance(setting['value'], list):
-                    value = ', '.join(setting['value'])
-                elif isinstance(setting['value'], str):
-                    value = '$${}$$'.format(setting['value'])
+                value = setting['value']
+                if isinstance(value, str):
+                    value = '$${}$$'.format(value)
+                elif isinstance(value, list):
+                    value = ', '.join(value)
                 else:
                     LOGGER.error('Unsupported setting value: %r',
                                  setting)
@@ -703,22 +850,20 @@ class Generate:
             else:
                 LOGGER.error('Unsupported setting: %r', setting)
                 raise RuntimeError
-            alter_role = self._dump.add_entry(
+            self._add_entry(
                 entry.desc, tag=entry.tag,
                 defn='ALTER ROLE {} SET {} TO {};\n'.format(
                     entry.tag, setting['name'], value),
-                dependencies=[entry.dump_id], dump_id=self._next_dump_id())
-            self._processed.add(alter_role.dump_id)
-            self._objects += 1
+                dependencies=[entry.dump_id])
 
     def _process_roles(self) -> typing.NoReturn:
         dependencies = self._process_role_dependencies()
-        for dump_id in toposort.toposort_flatten(dependencies):
+        for dump_id in self._sort_dependencies(dependencies):
             die_dump_id = self._process_role_drop(dump_id, dependencies)
             dependencies[dump_id].add(die_dump_id)
             entry = self._process_role_create(dump_id, dependencies)
-            desc, schema, name = self._reverse_lookup[dump_id]
-            definition = self._inventory[desc][schema][name].definition
+            definition = self._inventory[
+                self._reverse_lookup[dump_id]].definition
             if definition.get('settings'):
                 self._process_role_settings(entry, definition['settings'])
             self._process_role_acls(dump_id, definition.get('grants', {}))
@@ -741,39 +886,34 @@ class Generate:
                 if definition.get('authorization'):
                     sql.append('AUTHORIZATION')
                     sql.append(utils.quote_ident(definition['authorization']))
+                sql = ' '.join(sql) + ';\n'
             entry = self._add_generic_item(
                 constants.SCHEMA, '', name, sql, definition.get('owner'))
             self._maybe_add_comment(entry, definition)
+        self._schema_dump_ids = {
+            name: item.dump_id for (_desc, _schema, name), item
+            in self._inventory_by_type[constants.SCHEMA].items()}
 
     def _process_sequence_set_owned_by(self) -> typing.NoReturn:
-        for schema in self._inventory[constants.SEQUENCE]:
-            for name in self._inventory[constants.SEQUENCE][schema]:
-                item = self._inventory[constants.SEQUENCE][schema][name]
-                if 'owned_by' in item.definition:
-                    parts = item.definition['owned_by'].split('.')
-                    try:
-                        parent = self._lookup_entry(
-                            constants.TABLE, parts[0], parts[1])
-                    except RuntimeError:
-                        LOGGER.critical(
-                            'Failed to find parent for sequence %s.%s',
-                            schema, name)
-                        raise
-                    sql = [
-                        'ALTER SEQUENCE',
-                        '{}.{}'.format(item.definition.get('schema', schema),
-                                       item.definition.get('name', name)),
-                        'OWNED BY', item.definition['owned_by']
-                    ]
-                    acl = self._dump.add_entry(
-                        constants.SEQUENCE_OWNED_BY,
-                        item.definition.get('schema', schema),
-                        item.definition.get('name', name),
-                        defn='\n'.join(sql),
-                        dependencies=[parent.dump_id],
-                        dump_id=self._next_dump_id())
-                    self._processed.add(acl.dump_id)
-                    self._objects += 1
+        inventory = self._inventory
+        for item in self._inventory_by_type[constants.SEQUENCE].values():
+            definition = item.definition
+            owned_by = definition.get('owned_by')
+            if owned_by is not None:
+                parts = owned_by.split('.')
+                parent = inventory.get((constants.TABLE, parts[0], parts[1]))
+                if parent is None:
+                    LOGGER.critical(
+                        'Failed to find parent for sequence %s.%s',
+                        item.schema, item.name)
+                    raise RuntimeError
+                schema = definition.get('schema', item.schema)
+                name = definition.get('name', item.name)
+                self._add_entry(
+                    constants.SEQUENCE_OWNED_BY, schema, name,
+                    defn='ALTER SEQUENCE {}.{} OWNED BY {};\n'.format(
+                        schema, name, owned_by),
+                    dependencies=[parent.dump_id])
 
     def _process_servers(self) -> typing.NoReturn:
         for _schema, name, definition in self._iterate_files(constants.SERVER):
@@ -789,10 +929,8 @@ class Generate:
                 sql.append('FOREIGN DATA WRAPPER {}'.format(
                     utils.quote_ident(definition['fdw'])))
                 if 'options' in definition:
-                    sql.append(
-                        'OPTIONS ({})'.format(', '.join(
-                            ["{} '{}'".format(k, v)
-                             for k, v in definition['options'].items()])))
+                    sql.append(_options_sql(definition['options']))
+                sql = ' '.join(sql) + ';\n'
             entry = self._add_generic_item(
                 constants.FOREIGN_DATA_WRAPPER, '',
                 definition.get('name', name), sql,
@@ -820,32 +958,71 @@ class Generate:
                     'SERVER',
                     utils.quote_ident(definition['server'])]
                 if 'options' in definition:
-                    sql.append('OPTIONS')
-                    sql.append(
-                        '({})'.format(', '.join(
-                            ["{} '{}'".format(k, v)
-                             for k, v in definition['options'].items()])))
-            entry = self._dump.add_entry(
+                    sql.append(_options_sql(definition['options']))
+            entry = self._add_entry(
                 desc=constants.USER_MAPPING,
-                dump_id=self._next_dump_id(),
                 tag=definition.get('name', name),
                 owner=definition.get('owner', self._project.superuser),
-                defn='{};\n'.format(' '.join(sql)))
+                defn=' '.join(sql) + ';\n')
             self._maybe_add_comment(entry, definition)
-            self._objects += 1
-            self._processed.add(entry.dump_id)
 
-    @staticmethod
-    def _read_file(path: pathlib.Path) -> dict:
-        with path.open() as handle:
-            return yaml.safe_load(handle)
+    def _load_cache(self) -> dict:
+        """Load the parsed YAML cache from the last run, if there is one"""
+        try:
+            with open(self._cache_path, 'rb') as handle:
+                cached = pickle.load(handle)
+        except FileNotFoundError:
+            return {}
+        except Exception as error:  # Any failure means rebuilding the cache
+            LOGGER.debug('Ignoring unreadable cache %s: %s',
+                         self._cache_path, error)
+            return {}
+        if not isinstance(cached, dict) \
+                or cached.get('fingerprint') != _cache_fingerprint() \
+                or not isinstance(cached.get('files'), dict):
+            return {}
+        return cached['files']
+
+    def _parse_files(self, paths: typing.List[str]) -> typing.Iterable[dict]:
+        """Parse the YAML files, in the process pool when one is in use"""
+        if self._executor is None or len(paths) < 2:
+            return map(_load_yaml, paths)
+        return self._executor.map(_load_yaml, paths, chunksize=16)
+
+    def _read_files(self, paths: typing.List[str]) -> typing.List[dict]:
+        """Return the parsed YAML for each of the files. When the cache is
+        enabled, the cached value from the last run is used if a file has not
+        changed since.
+
+        The returned values are shared with the cache, so they must not be
+        modified in place while building the dump.
+
+        """
+        if not self._use_cache:
+            return list(self._parse_files(paths))
+        results, pending = {}, []
+        for path in paths:
+            stat = os.stat(path)
+            key = stat.st_mtime_ns, stat.st_size
+            cached = self._cached.get(path)
+            if cached is not None and cached[0] == key:
+                self._cache[path] = cached
+                results[path] = cached[1]
+            else:
+                pending.append((path, key))
+        parsed = self._parse_files([path for path, _key in pending])
+        for (path, key), data in zip(pending, parsed):
+            self._cache[path] = key, data
+            self._cache_changed = True
+            results[path] = data
+        return [results[path] for path in paths]
 
     def _read_project_file(self) -> _Project:
         project_file = self._project_path / 'project.yaml'
         if not project_file.exists():
             raise RuntimeError('Missing project file')
-        with open(project_file) as handle:
-            return _Project(**yaml.safe_load(handle))
+        with open(project_file, 'rb') as handle:
+            return _Project(**_YAML.load(handle))
 
     def _save_dump(self) -> typing.NoReturn:
         LOGGER.debug('Saving dump')
@@ -853,33 +1030,77 @@ class Generate:
             path = pathlib.Path(self._args.file)
         else:
             path = self._project_path / '{}.dump'.format(self._project.name)
-        if path.exists():
+        try:
             path.unlink()
+        except FileNotFoundError:
+            pass
         self._dump.save(path)
         LOGGER.info('Project pg_dump artifact created at %s', path)
+        self._save_cache()
+
+    def _save_cache(self) -> typing.NoReturn:
+        """Save the parsed YAML for the files read in this run"""
+        if not self._use_cache or (
+                not self._cache_changed
+                and self._cache.keys() == self._cached.keys()):
+            return
+        temp_path = self._cache_path.with_suffix('.tmp')
+        try:
+            self._cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(temp_path, 'wb') as handle:
+                pickle.dump(
+                    {'fingerprint': _cache_fingerprint(),
+                     'files': self._cache},
+                    handle, pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, self._cache_path)
+        except OSError as error:
+            LOGGER.warning('Failed to save the parse cache to %s: %s',
+                           self._cache_path, error)
+
+    @staticmethod
+    def _scandir(path: typing.Union[str, pathlib.Path]) \
+            -> typing.List[os.DirEntry]:
+        """Return the entries in the directory sorted by path, using the
+        cached type information from os.scandir instead of stat calls.
+
+        """
+        with os.scandir(path) as iterator:
+            return sorted(iterator, key=lambda e: e.path)
+
+    def _sort_dependencies(self, dependencies: dict) -> typing.List[int]:
+        order, cyclic = _toposort(dependencies)
+        if cyclic:
+            for dump_id in sorted(cyclic):
+                LOGGER.error('Circular dependency for %i %r', dump_id,
+                             self._reverse_lookup.get(dump_id))
+            raise RuntimeError('Circular dependencies found')
+        return order
+
+    def _store_item(self, item: _Item) -> _Item:
+        item.schema, item.name = _intern(item.schema), _intern(item.name)
+        key = item.obj_type, item.schema, item.name
+        self._inventory[key] = item
+        self._inventory_by_type[item.obj_type][key] = item
+        self._reverse_lookup[item.dump_id] = key
+        if self._debug:
+            LOGGER.debug('Added %s %s.%s: %r', *key, item)
+        return item
 
     def _system_role(self, name: str) -> bool:
         return name in ['PUBLIC', self._project.superuser]
 
     def _verify_data(self) -> typing.NoReturn:
-        errors = 0
-        for obj_type in self._inventory:
-            for schema in self._inventory[obj_type]:
-                LOGGER.debug('Validating %s objects in %s', obj_type, schema)
-                for name in self._inventory[obj_type][schema]:
-                    if schema in [constants.EXTENSION,
-                                  constants.FOREIGN_DATA_WRAPPER,
-                                  constants.GROUP,
-                                  constants.PROCEDURAL_LANGUAGE,
-                                  constants.ROLE,
-                                  constants.SCHEMA,
-                                  constants.SERVER,
-                                  constants.USER,
-                                  constants.USER_MAPPING]:
-                        schema = ''
-                    entry = self._dump.lookup_entry(obj_type, schema, name)
-                    if not entry and name not in ['postgres', 'PUBLIC']:
-                        LOGGER.error('Missing %s %s.%s',
-                                     obj_type, schema, name)
-                        errors += 1
+        errors, entries = 0, {}
+        for entry in self._dump.entries:
+            entries.setdefault((entry.desc, entry.namespace, entry.tag), entry)
+        for obj_type, items in self._inventory_by_type.items():
+            LOGGER.debug('Validating %s objects', obj_type)
+            for item in items.values():
+                schema, name = item.schema, item.name
+                if schema in _TYPE_SCHEMAS:
+                    schema = ''
+                entry = entries.get((obj_type, schema, name))
+                if not entry and name not in ['postgres', 'PUBLIC']:
+                    LOGGER.error('Missing %s %s.%s', obj_type, schema, name)
+                    errors += 1
         LOGGER.info('Verified dump against inventory, %i errors', errors)
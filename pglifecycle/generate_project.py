@@ -4,7 +4,9 @@ Generates Project Structure
 
 """
 import collections
+from concurrent import futures
 import dataclasses
+import itertools
 import logging
 import os
 import pathlib
@@ -23,50 +25,35 @@ LOGGER = logging.getLogger(__name__)
 DEFAULT_NAMESPACE = 'public'
 ISO_FORMAT = 'YYYY-MM-DD HH:mm:ss ZZ'
 SET_PATTERN = re.compile(r"SET .* = '(?P<value>.*)'")
+_SET_KEYS = ((constants.ENCODING, 'encoding'),
+             (constants.STDSTRINGS, 'stdstrings'))
 YAML_EXTENSION = 'yaml'
 
+_OMIT = frozenset()  # Set in worker processes by _init_worker
+_STRUCTURE = None
 
-def _filter(entries: typing.List[dump.Entry], desc: str,
-            parent_id: int = None) -> typing.Generator[dump.Entry, None, None]:
-    """Return a filtered list of the provided entries.
 
-    Generator function that iterates over the entries provided and
-    returns all matching entries. If ``parent_id`` is specified, it will
-    filter down to only entries that have the ``parent_id`` value in their
-    dependencies.
-
-    """
-    for e in [e for e in entries if e.desc == desc]:
-        if parent_id is not None:
-            if parent_id in e.dependencies:
-                yield e
-        else:
-            yield e
-
-
-def _function_filename(tag, filenames):
+def _function_filename(tag: str, filenames: dict) -> str:
     """Create a filename for a function file, using an auto-incrementing
     value for duplicate functions with different parameters.
 
     :param str tag: The entity tag
-    :param set filenames: Already used filenames
+    :param dict filenames: Already used filenames mapped to the last
+        suffix used for them
     :rtype: str
 
     """
-    counter = 1
     base = tag.split('(')[0]
     parts = tag.count(',')
     if parts:
-        filename = '{}-{}'.format(base, parts)
+        prefix = '{}-{}'.format(base, parts)
     else:
-        filename = base
-
+        prefix = base
+    filename = prefix
     while filename in filenames:
-        if parts:
-            filename = '{}-{}_{}'.format(base, parts, counter)
-        else:
-            filename = '{}_{}'.format(base, counter)
-        counter += 1
+        filenames[prefix] += 1
+        filename = '{}_{}'.format(prefix, filenames[prefix])
+    filenames[filename] = 0
     LOGGER.debug('Returning filename: %r', filename)
     return filename
 
@@ -76,27 +63,111 @@ _FILENAME_MAP = {
     constants.PROCEDURE: _function_filename
 }
 
+# Structure formatters for object types, others use Structure.generic
+_FORMATTERS = {
+    constants.OPERATOR: 'operator',
+    constants.SCHEMA: 'schema',
+    constants.SEQUENCE: 'sequence',
+    constants.SERVER: 'server',
+    constants.TABLE: 'table',
+    constants.VIEW: 'view'
+}
+
+
+def _build_entry(structure: 'Structure', entry: dump.Entry, formatter: str,
+                 omit: typing.AbstractSet[str]) -> dict:
+    """Return the data structure for the entry with empty values removed"""
+    return _remove_empty_values(getattr(structure, formatter)(entry), omit)
+
+
+def _formatter_name(object_type: str) -> str:
+    """Return the name of the Structure formatter for the object type"""
+    return _FORMATTERS.get(object_type, 'generic')
+
+
+def _init_worker(structure: 'Structure',
+                 omit: typing.AbstractSet[str]) -> typing.NoReturn:
+    """Set the structure and omitted keys used by _run_task in a worker
+    process
+
+    """
+    global _OMIT, _STRUCTURE
+    _OMIT = omit
+    _STRUCTURE = structure
+    _STRUCTURE.processed_ids = []
+
 
 def _prettify(sql: str) -> str:
     return sql.strip().rstrip(';')
 
 
-def _remove_null_values(values: dict) -> dict:
-    for key, value in list(values.items()):
-        if value is None or \
-                isinstance(value, (dict, list, str)) and not value:
-            del values[key]
-        elif isinstance(value, dict):
-            values[key] = _remove_null_values(value)
-            if not value:
-                del values[key]
+def _remove_empty_values(data: typing.Dict[str, typing.Any],
+                         omit: typing.AbstractSet[str]) -> dict:
+    """Remove keys from a dict that are empty or null and values
+    where it should be omitted due to cli args
+
+    :param dict data: The dict to remove empty values from
+    :param set omit: Keys to remove regardless of their value
+
+    """
+    for key, value in list(data.items()):
+        if isinstance(value, dict):
+            value = _remove_empty_values(value, omit)
         elif isinstance(value, list):
-            values[key] = [_remove_null_values(v)
-                           if isinstance(v, dict) else v
-                           for v in value]
+            value = [_remove_empty_values(i, omit)
+                     if isinstance(i, dict) else i for i in value]
+        if ((not value and not isinstance(value, int))
+                or value is None or key in omit):
+            del data[key]
+        else:
+            data[key] = value
+    return data
+
+
+def _remove_null_values(values: dict) -> dict:
+    """Remove null and empty values from the dict and any dicts nested in
+    it, walking the nested values with a stack instead of recursing.
+
+    """
+    stack, visited = [values], []
+    while stack:
+        current = stack.pop()
+        visited.append(current)
+        for key, value in list(current.items()):
+            if value is None or \
+                    isinstance(value, (dict, list, str)) and not value:
+                del current[key]
+            elif isinstance(value, dict):
+                stack.append(value)
+            elif isinstance(value, list):
+                stack.extend(v for v in value if isinstance(v, dict))
+    # Nested dicts are visited after their parents, so walking back up
+    # removes dicts emptied above before their parents are checked
+    for current in reversed(visited):
+        for key in [k for k, v in current.items()
+                    if isinstance(v, dict) and not v]:
+            del current[key]
     return values
 
 
+def _render_entry(structure: 'Structure', entry: dump.Entry, formatter: str,
+                  omit: typing.AbstractSet[str]) -> str:
+    """Return the rendered YAML file content for the entry"""
+    return storage.render(entry.desc, entry.tag,
+                          _build_entry(structure, entry, formatter, omit))
+
+
+def _run_task(entry: dump.Entry, formatter: str, task: typing.Callable) \
+        -> typing.Tuple[typing.Any, typing.List[int]]:
+    """Run the task for an entry in a worker process, returning its result
+    along with the dump_ids that were processed building it.
+
+    """
+    result = task(_STRUCTURE, entry, formatter, _OMIT)
+    dump_ids, _STRUCTURE.processed_ids = _STRUCTURE.processed_ids, []
+    return result, dump_ids
+
+
 class Generate:
     """Generate Project Structure"""
 
@@ -109,14 +180,21 @@ class Generate:
         self.dump_path = args.dump or pathlib.Path(self.tempdir.name) / \
             'pg-lifecycle-{}'.format(os.getpid())
         self.files_created = []
-        self._processed = set()
+        self._executor = None
+        self._filenames = collections.defaultdict(dict)
+        self._object_dirs = {}
+        self._omit = frozenset(
+            key for key, omit in (
+                ('owner', args.no_owner),
+                ('tablespace', args.no_tablespaces),
+                ('security label', args.no_security_labels)) if omit)
         self._roles = {}
         self.structure = None
 
     @property
-    def processed(self) -> set:
-        """Returns the set of processed dump_ids"""
-        return self._processed | self.structure.processed
+    def processed(self) -> bytearray:
+        """Returns the processed flags, indexed by dump_id"""
+        return self.structure.processed
 
     def run(self) -> typing.NoReturn:
         """Implement as core logic for generating the project"""
@@ -140,7 +218,8 @@ class Generate:
 
         LOGGER.debug('Loading dump from %s', self.dump_path)
         self.dump = pgdumplib.load(self.dump_path)
-        self.structure = Structure(self.dump.entries)
+        self.structure = Structure(
+            self.dump.entries, not self.args.no_dependencies)
 
         self._create_directories()
         self._create_project_file()
@@ -152,6 +231,55 @@ class Generate:
             self._create_group_files()
             self._create_user_files()
 
+        if self.args.jobs > 1:
+            self._executor = futures.ProcessPoolExecutor(
+                self.args.jobs, initializer=_init_worker,
+                initargs=(self.structure, self._omit))
+        try:
+            self._create_object_files()
+        finally:
+            if self._executor:
+                self._executor.shutdown()
+
+        processed = self.processed
+        remaining, unprocessed = collections.Counter(), []
+        for entry in self.dump.entries:
+            if processed[entry.dump_id]:
+                continue
+            unprocessed.append(entry)
+            if entry.desc != constants.SEARCHPATH:
+                remaining['{}:{}'.format(entry.section, entry.desc)] += 1
+
+        for key in sorted(remaining.keys(), reverse=True):
+            LOGGER.info('Remaining %s: %i', key, remaining[key])
+
+        if self.args.save_remaining:
+            LOGGER.debug('Writing remaining.yaml')
+            storage.save_documents(
+                self.project_path, 'remaining.yaml', None,
+                'Unprocessed dump entries', (
+                    _remove_null_values(dataclasses.asdict(e))
+                    for e in unprocessed))
+
+        if self.args.gitkeep or self.args.remove_empty_dirs:
+            storage.cleanup(self.project_path, self.args.gitkeep,
+                            self.args.remove_empty_dirs)
+
+    def _create_directories(self) -> typing.NoReturn:
+        LOGGER.debug('Creating %s', self.project_path)
+        os.makedirs(self.project_path, exist_ok=self.args.force)
+        project_path = str(self.project_path)
+        for value in constants.PATHS.values():
+            subdir_path = os.path.join(project_path, value)
+            try:
+                os.mkdir(subdir_path)
+            except FileExistsError:
+                pass
+            if self.args.gitkeep:
+                storage.create_gitkeep(subdir_path)
+
+    def _create_object_files(self) -> typing.NoReturn:
+        """Generate the files for all of the object types"""
         self._create_namespace_files(constants.CAST)
         self._create_namespace_files(constants.COLLATION)
         self._create_namespace_files(constants.CONVERSION)
@@ -175,44 +303,11 @@ class Generate:
         self._create_files(constants.USER_MAPPING)
         self._create_files(constants.VIEW)
 
-        remaining = collections.Counter()
-        for entry in [e for e in self.dump.entries
-                      if e.dump_id not in self.processed
-                      and e.desc != constants.SEARCHPATH]:
-            remaining['{}:{}'.format(entry.section, entry.desc)] += 1
-
-        for key in sorted(remaining.keys(), reverse=True):
-            LOGGER.info('Remaining %s: %i', key, remaining[key])
-
-        if self.args.save_remaining:
-            LOGGER.debug('Writing remaining.yaml')
-            with open(self.project_path / 'remaining.yaml', 'w') as handle:
-                storage.yaml_dump(handle, [
-                    dataclasses.asdict(e) for e in self.dump.entries
-                    if e.dump_id not in self.processed])
-
-        if self.args.gitkeep:
-            storage.remove_unneeded_gitkeeps(self.project_path)
-        if self.args.remove_empty_dirs:
-            storage.remove_empty_directories(self.project_path)
-
-    def _create_directories(self) -> typing.NoReturn:
-        LOGGER.debug('Creating %s', self.project_path)
-        os.makedirs(self.project_path, exist_ok=self.args.force)
-        for value in constants.PATHS.values():
-            subdir_path = self.project_path / value
-            try:
-                os.makedirs(subdir_path, exist_ok=self.args.force)
-            except FileExistsError:
-                pass
-            if self.args.gitkeep:
-                storage.create_gitkeep(subdir_path)
-
     def _create_project_file(self) -> typing.NoReturn:
         """Generates project.yaml"""
         LOGGER.debug('Creating the project file (project.yaml)')
-        temp = [e for e in self.dump.entries if e.desc == constants.DATABASE]
-        self._mark_processed(temp[0].dump_id)
+        database = self.structure.filter(constants.DATABASE)[0]
+        self._mark_processed(database.dump_id)
         comments = {
             'pg_dump version': self.dump.dump_version,
             'postgres version': self.dump.server_version,
@@ -221,11 +316,10 @@ class Generate:
         project = {
             'name': self.dump.dbname
         }
-        for entry in self.dump.entries:
-            if entry.defn.startswith('SET '):
+        for desc, key in _SET_KEYS:
+            for entry in self.structure.filter(desc):
                 self._mark_processed(entry.dump_id)
-                match = SET_PATTERN.match(entry.defn)
-                project[entry.tag.lower()] = match.group(1)
+                project[key] = SET_PATTERN.match(entry.defn).group(1)
         project.update({
             'extensions': self._find_extensions(),
             'languages': self._find_languages(),
@@ -239,28 +333,25 @@ class Generate:
     def _create_files(self, object_type: str) -> typing.NoReturn:
         """Generate the schema files for the given object type"""
         LOGGER.info('Creating %s files', object_type.lower())
-        formatter = getattr(self.structure,
-                            object_type.lower().replace(' ', '_'),
-                            self.structure.generic)
-        for entry in _filter(self.dump.entries, object_type):
+        for entry, content in self._map_entries(
+                self.structure.filter(object_type),
+                _formatter_name(object_type), _render_entry):
             self._mark_processed(entry.dump_id)
-            data = formatter(entry)
-            data = self._remove_empty_values(data)
             filename = None
             if entry.desc in _FILENAME_MAP:
                 filename = _FILENAME_MAP[entry.desc](
-                    entry.tag, self.files_created)
+                    entry.tag, self._filenames[entry.desc, entry.namespace])
             file_path = self._object_path(entry, filename)
             if str(file_path) in self.ignore:
                 LOGGER.debug('Skipping %s', file_path)
                 continue
             self.files_created.append(
-                storage.save(self.project_path, file_path, entry.desc,
-                             entry.tag, data))
+                storage.write(self.project_path, file_path, content))
 
     def _create_group_files(self) -> typing.NoReturn:
         """Generate the group files based upon the collected information"""
         LOGGER.info('Creating group files')
+        group_path = constants.PATHS[constants.GROUP]
         for role in [
                 r for r in self._roles.values() if r['type'] == constants.GROUP
         ]:
@@ -277,7 +368,7 @@ class Generate:
                 'options': role.get('options'),
                 'settings': role.get('settings')
             }
-            file_path = constants.PATHS[constants.GROUP] / '{}.{}'.format(
+            file_path = group_path / '{}.{}'.format(
                 role['role'], YAML_EXTENSION)
             if str(file_path) in self.ignore:
                 LOGGER.debug('Skipping %s', file_path)
@@ -289,20 +380,20 @@ class Generate:
     def _create_namespace_files(self, object_type: str) -> typing.NoReturn:
         """Generate the schema files for the given object type"""
         LOGGER.info('Creating %s files', object_type.lower())
-        formatter = getattr(self.structure,
-                            object_type.lower().replace(' ', '_'),
-                            self.structure.generic)
         namespace = {}
-        for entry in _filter(self.dump.entries, object_type):
+        for entry, data in self._map_entries(
+                self.structure.filter(object_type),
+                _formatter_name(object_type), _build_entry):
             self._mark_processed(entry.dump_id)
             if entry.namespace not in namespace.keys():
                 namespace[entry.namespace] = []
-            data = formatter(entry)
-            data = self._remove_empty_values(data)
             namespace[entry.namespace].append(data)
+        if not namespace:
+            return
+        object_path = constants.PATHS[object_type]
+        key = '{}S'.format(object_type)
         for value in namespace.keys():
-            key = '{}S'.format(object_type)
-            file_path = constants.PATHS[object_type] / '{}.{}'.format(
+            file_path = object_path / '{}.{}'.format(
                 value, YAML_EXTENSION)
             if str(file_path) in self.ignore:
                 LOGGER.debug('Skipping %s', file_path)
@@ -317,29 +408,27 @@ class Generate:
         """Generate the schema files for operators"""
         LOGGER.info('Creating operator files')
         namespace = {}
-        for obj_type in {constants.OPERATOR, constants.OPERATOR_CLASS}:
-            for entry in _filter(self.dump.entries, obj_type):
-                self._mark_processed(entry.dump_id)
-                if entry.namespace not in namespace.keys():
-                    namespace[entry.namespace] = []
-                data = self.structure.operator(entry)
-                data = self._remove_empty_values(data)
-                namespace[entry.namespace].append(data)
-            for value in namespace.keys():
-                for offset, row in namespace[value]:
-                    if 'schema' in row.keys():
-                        del namespace[value][offset]['schema']
-                self.files_created.append(
-                    storage.save(
-                        self.project_path,
-                        constants.PATHS[constants.OPERATOR] / '{}.{}'.format(
-                            value, YAML_EXTENSION), '{}S'.format(
-                                constants.OPERATOR), value, {
-                                    'operators': namespace[value]}))
+        for entry, data in self._map_entries(
+                self.structure.filter(constants.OPERATOR)
+                + self.structure.filter(constants.OPERATOR_CLASS),
+                'operator', _build_entry):
+            self._mark_processed(entry.dump_id)
+            if entry.namespace not in namespace.keys():
+                namespace[entry.namespace] = []
+            namespace[entry.namespace].append(data)
+        operator_path = constants.PATHS[constants.OPERATOR]
+        key = '{}S'.format(constants.OPERATOR)
+        for value in namespace.keys():
+            self.files_created.append(
+                storage.save(
+                    self.project_path,
+                    operator_path / '{}.{}'.format(value, YAML_EXTENSION),
+                    key, value, {'operators': namespace[value]}))
 
     def _create_role_files(self) -> typing.NoReturn:
         """Generate the role files based upon the collected information"""
         LOGGER.info('Creating role file')
+        role_path = constants.PATHS[constants.ROLE]
         for role in [
                 r for r in self._roles.values()
                 if not r.get('password') and r['type'] == constants.ROLE
@@ -359,27 +448,28 @@ class Generate:
             }
             self.files_created.append(
                 storage.save(self.project_path,
-                             constants.PATHS[constants.ROLE] / '{}.{}'.format(
+                             role_path / '{}.{}'.format(
                                  role['role'], YAML_EXTENSION), constants.ROLE,
                              role['role'], data))
 
     def _create_schema_files(self) -> typing.NoReturn:
         """Generate the schema files for the given object type"""
         LOGGER.info('Creating schemata files')
-        for entry in _filter(self.dump.entries, constants.SCHEMA):
+        schema_path = constants.PATHS[constants.SCHEMA]
+        for entry, content in self._map_entries(
+                self.structure.filter(constants.SCHEMA), 'schema',
+                _render_entry):
             self._mark_processed(entry.dump_id)
-            data = self.structure.schema(entry)
-            data = self._remove_empty_values(data)
             self.files_created.append(
-                storage.save(
+                storage.write(
                     self.project_path,
-                    constants.PATHS[constants.SCHEMA] / '{}.{}'.format(
-                        entry.tag, YAML_EXTENSION),
-                    entry.desc, entry.tag, data))
+                    schema_path / '{}.{}'.format(entry.tag, YAML_EXTENSION),
+                    content))
 
     def _create_user_files(self) -> typing.NoReturn:
         """Generate the role files based upon the collected information"""
         LOGGER.info('Creating user files')
+        user_path = constants.PATHS[constants.USER]
         for role in [r for r in self._roles.values()
                      if r.get('password') or r['type'] == constants.USER]:
             data = {
@@ -398,7 +488,7 @@ class Generate:
             }
             self.files_created.append(
                 storage.save(self.project_path,
-                             constants.PATHS[constants.USER] / '{}.{}'.format(
+                             user_path / '{}.{}'.format(
                                  role['role'], YAML_EXTENSION), constants.USER,
                              role['role'], data))
 
@@ -425,7 +515,7 @@ class Generate:
                 line = line.rstrip()
                 if not line or line.startswith('--') or line.startswith('SET'):
                     continue
-                parsed = parse.sql(line)
+                parsed = dict(parse.cached_sql(line)[0])
                 if parsed['role'] not in self._roles:
                     self._roles[parsed['role']] = self._empty_role()
                 if 'options' in parsed and parsed['options']:
@@ -451,7 +541,7 @@ class Generate:
 
     def _find_extensions(self) -> list:
         extensions = []
-        for entry in _filter(self.dump.entries, constants.EXTENSION):
+        for entry in self.structure.filter(constants.EXTENSION):
             self._mark_processed(entry.dump_id)
             # parsed = parse.sql(entry.defn) @ TODO work through this
             extensions.append(
@@ -464,24 +554,50 @@ class Generate:
 
     def _find_languages(self) -> list:
         languages = []
-        for entry in _filter(self.dump.entries, constants.PROCEDURAL_LANGUAGE):
-            languages.append(parse.sql(entry.defn))
+        for entry in self.structure.filter(constants.PROCEDURAL_LANGUAGE):
+            languages.append(dict(parse.cached_sql(entry.defn)[0]))
             self._mark_processed(entry.dump_id)
         return languages
 
     def _find_shell_types(self) -> list:
         values = []
-        for entry in _filter(self.dump.entries, constants.SHELL_TYPE):
+        for entry in self.structure.filter(constants.SHELL_TYPE):
             self._mark_processed(entry.dump_id)
             values.append(entry.defn.strip())
         return values
 
-    def _mark_processed(self, dump_id: int) -> typing.NoReturn:
-        self._processed.add(dump_id)
+    def _map_entries(self, entries: typing.List[dump.Entry], formatter: str,
+                     task: typing.Callable) \
+            -> typing.Generator[typing.Tuple[dump.Entry, typing.Any],
+                                None, None]:
+        """Iterate over the entries, returning each entry along with the
+        result of running the task with the named Structure formatter for
+        it. The tasks are run in the process pool when more than one job
+        is specified.
 
-    @staticmethod
-    def _object_path(entry: dump.Entry, name_override: str = None) -> str:
-        return constants.PATHS[entry.desc] / entry.namespace / '{}.{}'.format(
+        """
+        if self._executor is None or len(entries) < 2:
+            for entry in entries:
+                yield entry, task(self.structure, entry, formatter, self._omit)
+            return
+        chunk_size = max(1, len(entries) // (self.args.jobs * 4))
+        for entry, (result, dump_ids) in zip(entries, self._executor.map(
+                _run_task, entries, itertools.repeat(formatter),
+                itertools.repeat(task), chunksize=chunk_size)):
+            for dump_id in dump_ids:
+                self.structure.processed[dump_id] = 1
+            yield entry, result
+
+    def _mark_processed(self, dump_id: int) -> typing.NoReturn:
+        self.structure.processed[dump_id] = 1
+
+    def _object_path(self, entry: dump.Entry,
+                     name_override: str = None) -> pathlib.Path:
+        key = entry.desc, entry.namespace
+        if key not in self._object_dirs:
+            self._object_dirs[key] = \
+                constants.PATHS[entry.desc] / entry.namespace
+        return self._object_dirs[key] / '{}.{}'.format(
             name_override or entry.tag, YAML_EXTENSION)
 
     def _process_acls(self) -> typing.NoReturn:
@@ -500,8 +616,9 @@ class Generate:
                 acls.remove(record)
             return acls
 
-        for entry in _filter(self.dump.entries, constants.ACL):
-            for acl in _maybe_ignore_revoke(parse.sql(entry.defn)):
+        for entry in self.structure.filter(constants.ACL):
+            for acl in _maybe_ignore_revoke(
+                    list(parse.cached_sql(entry.defn))):
                 if acl['to'] not in self._roles:
                     self._roles[acl['to']] = self._empty_role()
                     self._roles[acl['to']]['role'] = acl['to']
@@ -527,37 +644,42 @@ class Generate:
                     raise ValueError('Unsupported ACL: {!r}'.format(acl))
             self._mark_processed(entry.dump_id)
 
-    def _remove_empty_values(self, data: typing.Dict[str, typing.Any]) \
-            -> dict:
-        """Remove keys from a dict that are empty or null and values
-        where it should be omitted due to cli args
-
-        :param dict data: The dict to remove empty values from
-
-        """
-        for key, value in list(data.items()):
-            if ((not value and not isinstance(value, int))
-                    or value is None
-                    or (key == 'owner' and self.args.no_owner)
-                    or (key == 'tablespace' and self.args.no_tablespaces)
-                    or (key == 'security label'
-                        and self.args.no_security_labels)):
-                del data[key]
-            if isinstance(value, dict):
-                data[key] = self._remove_empty_values(value)
-            elif isinstance(value, list):
-                data[key] = [self._remove_empty_values(i)
-                             if isinstance(i, dict) else i for i in value]
-        return _remove_null_values(data)
-
 
 class Structure:
     """Returns SQL sql based data structures"""
 
-    def __init__(self, entries: list):
-        self.dependency_cache = {}
+    def __init__(self, entries: list, include_dependencies: bool = True):
         self.entries = entries
-        self.processed = set()
+        self.include_dependencies = include_dependencies
+        self._by_dump_id = {e.dump_id: e for e in entries}
+        self.processed = bytearray(max(self._by_dump_id, default=0) + 1)
+        # Set to a list in worker processes to record the marked dump_ids
+        self.processed_ids = None
+        self._names = {e.dump_id: self._object_name(e) for e in entries}
+        self._by_desc = collections.defaultdict(list)
+        self._by_parent = collections.defaultdict(list)
+        self._comments = collections.defaultdict(list)
+        for entry in entries:
+            self._by_desc[entry.desc].append(entry)
+            kind = entry.tag.partition(' ')[0]
+            for dump_id in set(entry.dependencies):
+                self._by_parent[dump_id, entry.desc].append(entry)
+                if entry.desc == constants.COMMENT:
+                    self._comments[(dump_id, kind)].append(entry)
+
+    def filter(self, desc: str, parent_id: typing.Optional[int] = None) \
+            -> typing.List[dump.Entry]:
+        """Return the entries matching ``desc`` in dump order.
+
+        If ``parent_id`` is specified, only entries that have the
+        ``parent_id`` value in their dependencies are returned. The lookups
+        use the indexes built at construction time instead of scanning all
+        of the entries in the dump.
+
+        """
+        if parent_id is None:
+            return list(self._by_desc.get(desc, []))
+        return list(self._by_parent.get((parent_id, desc), []))
 
     def generic(self, entry: dump.Entry) -> dict:
         """Return a data structure for for the entry"""
@@ -601,7 +723,7 @@ class Structure:
         value = self.generic(entry)
         children = self._find_children(entry, constants.SEQUENCE_OWNED_BY)
         for child in children:
-            parsed = parse.sql(child['sql'])
+            parsed = parse.cached_sql(child['sql'])[0]
             if parsed.get('options', {}).get('name') == 'owned_by':
                 value['owned_by'] = '.'.join(parsed['options']['arg'])
             else:
@@ -665,7 +787,7 @@ class Structure:
 
     def _find_acls(self, parent: dump.Entry) -> list:
         acls = []
-        for entry in _filter(self.entries, constants.ACL, parent.dump_id):
+        for entry in self.filter(constants.ACL, parent.dump_id):
             if entry.tag.startswith(parent.tag):
                 self._mark_processed(entry.dump_id)
                 for line in entry.defn.splitlines(False):
@@ -675,58 +797,53 @@ class Structure:
 
     def _find_children(self, parent: dump.Entry, entry_type) -> list:
         children = []
-        parent_name = self._object_name(parent)
+        parent_name = self._names[parent.dump_id]
+        parent_key = parent.namespace, parent.tag
         ignore = {parent.desc: parent_name}
-        for entry in _filter(self.entries, entry_type, parent.dump_id):
+        for entry in self.filter(entry_type, parent.dump_id):
             add_child = False
             if entry.tag.startswith(parent.tag):
                 add_child = True
             else:
-                queries = parse.sql(entry.defn)
-                if not isinstance(queries, list):
-                    queries = [queries]
-                for parsed in queries:
-                    LOGGER.debug('Parsed: %r', parsed)
-                    parsed_child = parsed.get('relation')
-                    if parsed_child and '.' not in parsed_child:
-                        parsed_child = '{}.{}'.format(entry.namespace,
-                                                      parsed_child)
-                    LOGGER.debug('Checking %r against %r', parsed_child,
-                                 parent_name)
-                    if parsed_child == parent_name:
+                for parsed in parse.cached_sql(entry.defn):
+                    relation = parsed.get('relation')
+                    if relation is None:
+                        raise RuntimeError
+                    namespace, sep, name = relation.partition('.')
+                    if not sep:
+                        namespace, name = entry.namespace, relation
+                    if (namespace, name) == parent_key:
                         add_child = True
                         break
-                    elif parsed_child is None:
-                        raise RuntimeError
             if add_child:
-                LOGGER.debug('Adding %s child %s to %s - %r', entry_type,
-                             self._object_name(entry), parent_name, entry)
+                if LOGGER.isEnabledFor(logging.DEBUG):
+                    LOGGER.debug('Adding %s child %s to %s - %r', entry_type,
+                                 self._names[entry.dump_id], parent_name,
+                                 entry)
                 self._mark_processed(entry.dump_id)
                 deps = self._resolve_dependencies(entry.dependencies)
                 try:
                     deps.remove(ignore)
                 except ValueError:
                     pass
-                child = {
-                    'name': entry.tag,
-                    'schema': entry.namespace,
-                    'owner': entry.owner,
-                    'tablespace': entry.tablespace,
-                    'comment': self._find_comment(entry),
-                    'sql': _prettify(entry.defn),
-                    'dependencies': deps,
-                    'acls': self._find_children(entry, constants.ACL)
-                }
-                child = _remove_null_values(child)
-                children.append(child)
+                children.append({
+                    key: value for key, value in (
+                        ('name', entry.tag),
+                        ('schema', entry.namespace),
+                        ('owner', entry.owner),
+                        ('tablespace', entry.tablespace),
+                        ('comment', self._find_comment(entry)),
+                        ('sql', _prettify(entry.defn)),
+                        ('dependencies', deps),
+                        ('acls', self._find_children(entry, constants.ACL)))
+                    if value})
         return children
 
     def _find_column_comments(self, parent: dump.Entry) -> list:
         comments = []
-        for entry in _filter(self.entries, constants.COMMENT, parent.dump_id):
-            if entry.tag.startswith('COLUMN'):
-                self._mark_processed(entry.dump_id)
-                comments.append(_prettify(entry.defn))
+        for entry in self._comments.get((parent.dump_id, 'COLUMN'), []):
+            self._mark_processed(entry.dump_id)
+            comments.append(_prettify(entry.defn))
         return comments
 
     def _find_comment(self, parent: dump.Entry) -> typing.Optional[str]:
@@ -737,20 +854,19 @@ class Structure:
             expectation = 'ON {}'.format(parent_name.split(' ')[0])
         else:
             expectation = '{} {}'.format(parent.desc, parent_name)
-        for entry in _filter(self.entries, constants.COMMENT, parent.dump_id):
-            LOGGER.debug('Expectation: %r / %r', expectation, entry.tag)
+        kind = parent.desc.partition(' ')[0]
+        for entry in self._comments.get((parent.dump_id, kind), []):
             if ((parent.desc == constants.TRIGGER and entry.tag.startswith(
                     constants.TRIGGER) and entry.tag.endswith(expectation))
                     or entry.tag.startswith(expectation)):
-                LOGGER.debug('Comment matches expectation (%r): %r',
-                             expectation, entry.dump_id)
                 self._mark_processed(entry.dump_id)
-                parsed = parse.sql(entry.defn)
-                return parsed['comment']
+                return parse.cached_sql(entry.defn)[0]['comment']
         return None
 
     def _mark_processed(self, dump_id: int) -> typing.NoReturn:
-        self.processed.add(dump_id)
+        self.processed[dump_id] = 1
+        if self.processed_ids is not None:
+            self.processed_ids.append(dump_id)
 
     @staticmethod
     def _object_name(value: dump.Entry) -> str:
@@ -766,16 +882,12 @@ class Structure:
         :rtype: list
 
         """
-        key = ','.join(str(d) for d in dependencies)
-        if key in self.dependency_cache:
-            return self.dependency_cache[key]
-        LOGGER.debug('Resolving dependencies: %r', dependencies)
+        if not self.include_dependencies:
+            return []
         values = []
-        for entry in [e for e in self.entries if e.dump_id in dependencies]:
-            if entry.desc == constants.SCHEMA:
+        for dump_id in dependencies:
+            entry = self._by_dump_id.get(dump_id)
+            if entry is None or entry.desc == constants.SCHEMA:
                 continue
-            values.append({entry.desc: self._object_name(entry)})
-        self.dependency_cache[key] = values
-        if len(self.dependency_cache.keys()) > 1024:
-            del self.dependency_cache[list(self.dependency_cache.keys())[0]]
-        return self.dependency_cache[key]
+            values.append({entry.desc: self._names[dump_id]})
+        return values
@@ -1,3 +1,4 @@
+import functools
 import logging
 import typing
 
@@ -12,3 +13,14 @@ def sql(value: str) -> typing.Generator[dict, None, None]:
     """Parse a blob with one or more SQL statements"""
     for node in pgparse.parse(value):
         yield tokenizer.from_libpg_query(node)
+
+
+@functools.lru_cache(maxsize=None)
+def cached_sql(value: str) -> typing.Tuple[dict, ...]:
+    """Parse a blob with one or more SQL statements, memoizing the result.
+
+    The parsed statements are shared between callers and must not be
+    modified in place.
+
+    """
+    return tuple(sql(value))
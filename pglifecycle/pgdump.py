@@ -47,7 +47,8 @@ class _PGDump:
                 command += ['--{}'.format(optional.replace('_', '-'))]
         if self.args.role:
             command += ['--role', self.args.role]
-        LOGGER.debug('Dump command: %r', ' '.join(command))
+        if LOGGER.isEnabledFor(logging.DEBUG):
+            LOGGER.debug('Dump command: %r', ' '.join(command))
         return command
 
     @staticmethod
@@ -78,7 +79,8 @@ class _PGDumpRoles(_PGDump):
             '-r']
         if self.args.role:
             command += ['--role', self.args.role]
-        LOGGER.debug('Dump command: %r', ' '.join(command))
+        if LOGGER.isEnabledFor(logging.DEBUG):
+            LOGGER.debug('Dump command: %r', ' '.join(command))
         return command
 
 
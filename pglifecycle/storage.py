@@ -1,4 +1,5 @@
 import datetime
+import io
 import logging
 import os
 import pathlib
@@ -13,13 +14,37 @@ LINE_LENGTH = 80
 MAX_SINGLE_LINE_LENGTH = 120
 
 
-def create_gitkeep(directory: pathlib.Path) -> typing.NoReturn:
+def create_gitkeep(directory: typing.Union[str, pathlib.Path]) \
+        -> typing.NoReturn:
     """Create a .gitkeep file in the specified directory
 
-    :param pathlib.Path directory:
+    :param directory: The directory to create the file in
+    :type directory: str or pathlib.Path
 
     """
-    open(str(directory / '.gitkeep'), 'w').close()
+    os.close(os.open(os.path.join(directory, '.gitkeep'),
+                     os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666))
+
+
+def cleanup(path: pathlib.Path, gitkeeps: bool = False,
+            empty_directories: bool = False) -> typing.NoReturn:
+    """Remove unneeded .gitkeep files and/or empty directories from under
+    the object directories of the project in a single bottom-up walk, so a
+    directory left empty by removing its empty subdirectories is removed
+    as well.
+
+    A .gitkeep file is unneeded in a directory with subdirectories or
+    other files in it. Symlinks to directories count as subdirectories and
+    are not followed, as with os.walk.
+
+    :param pathlib.Path path: The project path to clean up
+    :param bool gitkeeps: Remove unneeded .gitkeep files
+    :param bool empty_directories: Remove empty directories
+
+    """
+    for subdir in constants.PATHS.values():
+        _cleanup_directory(
+            os.path.join(path, subdir), gitkeeps, empty_directories)
 
 
 def remove_empty_directories(path: pathlib.Path) -> typing.NoReturn:
@@ -28,10 +53,7 @@ def remove_empty_directories(path: pathlib.Path) -> typing.NoReturn:
     :param pathlib.Path path: The project path to clean up
 
     """
-    for subdir in constants.PATHS.values():
-        for root, dirs, files in os.walk(path / subdir):
-            if not len(dirs) and not len(files):
-                os.rmdir(root)
+    cleanup(path, empty_directories=True)
 
 
 def remove_unneeded_gitkeeps(path: pathlib.Path) -> typing.NoReturn:
@@ -41,12 +63,25 @@ def remove_unneeded_gitkeeps(path: pathlib.Path) -> typing.NoReturn:
     :param pathlib.Path path: The project path to clean up
 
     """
-    for subdir in constants.PATHS.values():
-        for root, dirs, files in os.walk(path / subdir):
-            if (len(dirs) or len(files) > 1) and '.gitkeep' in files:
-                gitkeep = pathlib.Path(root) / '.gitkeep'
-                LOGGER.debug('Removing %s', gitkeep)
-                gitkeep.unlink()
+    cleanup(path, gitkeeps=True)
+
+
+def render(doc_type: str, doc_name: str, data: dict,
+           comments: dict = None) -> str:
+    """Return the data as a YAML document with the file header comments
+
+    :param str doc_type: The type of document being written
+    :param str doc_name: The name of the object the document is written for
+    :param dict data: The data for the file
+    :param dict comments: Extra comments to throw in the header
+    :rtype: str
+
+    """
+    buffer = io.StringIO()
+    _write_header(buffer, doc_type, doc_name, comments)
+    buffer.write('---\n')
+    yaml.dump(buffer, data)
+    return buffer.getvalue()
 
 
 def save(base_path: pathlib.Path, path: str, doc_type: str, doc_name: str,
@@ -61,23 +96,94 @@ def save(base_path: pathlib.Path, path: str, doc_type: str, doc_name: str,
     :param dict comments: Extra comments to throw in the header
     :returns: File path written
 
+    """
+    return write(base_path, path, render(doc_type, doc_name, data, comments))
+
+
+def save_documents(base_path: pathlib.Path, path: str, doc_type: str,
+                   doc_name: str, documents: typing.Iterable[dict]) -> str:
+    """Write each item in documents out to the specified path as a
+    separate YAML document, streaming them to the file as they are
+    produced.
+
+    :param str base_path: The base path to write files to
+    :param str path: The relative path to the file
+    :param str doc_type: The type of document being written
+    :param str doc_name: The name of the object the document is written for
+    :param documents: The data for each document in the file
+    :type documents: typing.Iterable[dict]
+    :returns: File path written
+
+    """
+    file_path = base_path / path
+    LOGGER.debug('Writing to %s', file_path)
+    with open(str(file_path), 'w') as handle:
+        _write_header(handle, doc_type, doc_name)
+        for document in documents:
+            yaml.dump(handle, document)
+    return path
+
+
+def write(base_path: pathlib.Path, path: str, content: str) -> str:
+    """Write previously rendered content out to the specified path
+
+    :param str base_path: The base path to write files to
+    :param str path: The relative path to the file
+    :param str content: The rendered file content
+    :returns: File path written
+
     """
     file_path = base_path / path
     LOGGER.debug('Writing to %s', file_path)
     if not file_path.parent.exists():
         file_path.parent.mkdir()
     with open(str(file_path), 'w') as handle:
-        if doc_type and doc_name:
-            handle.write('# {}: {}\n'.format(doc_type, doc_name))
-        elif doc_type:
-            handle.write('# {}\n'.format(doc_type))
-        elif doc_name:
-            handle.write('# {}\n'.format(doc_name))
-        handle.write('# Created with pglifecycle v{} ({})\n'.format(
-            version, datetime.datetime.now(tz=tz.UTC).isoformat(
-                sep=' ', timespec='seconds')))
-        for key, value in (comments or {}).items():
-            handle.write('# {}: {}\n'.format(key, value))
-        handle.write('---\n')
-        yaml.dump(handle, data)
+        handle.write(content)
     return path
+
+
+def _write_header(handle: typing.TextIO, doc_type: str, doc_name: str,
+                  comments: dict = None) -> typing.NoReturn:
+    if doc_type and doc_name:
+        handle.write('# {}: {}\n'.format(doc_type, doc_name))
+    elif doc_type:
+        handle.write('# {}\n'.format(doc_type))
+    elif doc_name:
+        handle.write('# {}\n'.format(doc_name))
+    handle.write('# Created with pglifecycle v{} ({})\n'.format(
+        version, datetime.datetime.now(tz=tz.UTC).isoformat(
+            sep=' ', timespec='seconds')))
+    for key, value in (comments or {}).items():
+        handle.write('# {}: {}\n'.format(key, value))
+
+
+def _cleanup_directory(path: str, gitkeeps: bool,
+                       empty_directories: bool) -> bool:
+    """Clean up the subdirectories of the directory before the directory
+    itself, returning True if the directory was removed.
+
+    """
+    dirs, files = [], []
+    try:
+        with os.scandir(path) as iterator:
+            entries = list(iterator)
+    except OSError:
+        return False
+    for entry in entries:
+        if entry.is_dir(follow_symlinks=False):
+            if not _cleanup_directory(
+                    entry.path, gitkeeps, empty_directories):
+                dirs.append(entry.name)
+        elif entry.is_symlink() and entry.is_dir():
+            dirs.append(entry.name)
+        else:
+            files.append(entry.name)
+    if gitkeeps and '.gitkeep' in files and (dirs or len(files) > 1):
+        gitkeep = os.path.join(path, '.gitkeep')
+        LOGGER.debug('Removing %s', gitkeep)
+        os.unlink(gitkeep)
+        files.remove('.gitkeep')
+    if empty_directories and not dirs and not files:
+        os.rmdir(path)
+        return True
+    return False
@@ -2,12 +2,14 @@
 Misc Utilities
 
 """
+import functools
 import re
 import typing
 
 NO_QUOTE = re.compile('^[a-z0-9_]+$')
 
 
+@functools.lru_cache(maxsize=4096)
 def quote_ident(value: str) -> str:
     """Quote a PostgreSQL identifier (object name, etc)"""
     if NO_QUOTE.search(value):
@@ -2,6 +2,7 @@
 Common interface for working with YAML files
 
 """
+import io
 import logging
 import pathlib
 import typing
@@ -11,6 +12,10 @@ from ruamel.yaml import scalarstring, scanner
 
 LOGGER = logging.getLogger(__name__)
 
+_EMITTER = yaml.YAML()
+_EMITTER.default_flow_style = False
+_EMITTER.indent(mapping=2, sequence=4, offset=2)
+
 
 def is_yaml(path: pathlib.Path) -> bool:
     """Returns `True` if the file exists and ends with a YAML extension"""
@@ -40,17 +45,16 @@ def save(path: pathlib.Path, data: dict) -> typing.NoReturn:
     :param dict data: The data for the file
 
     """
+    buffer = io.StringIO()
+    dump(buffer, data)
     with path.open('w') as handle:
-        dump(handle, data)
+        handle.write(buffer.getvalue())
 
 
 def dump(handle: typing.TextIO, data: dict) -> typing.NoReturn:
     """Save the data in YAML format to the IO handle."""
     handle.write('---\n')
-    yml = yaml.YAML()
-    yml.default_flow_style = False
-    yml.indent(mapping=2, sequence=4, offset=2)
-    yml.dump(_yaml_reformat(data), handle)
+    _EMITTER.dump(_yaml_reformat(data), handle)
 
 
 def _yaml_reformat(data: typing.Any) -> typing.Any:
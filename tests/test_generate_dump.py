@@ -0,0 +1,275 @@
+import argparse
+import os
+import pathlib
+import pickle
+import tempfile
+import unittest
+from unittest import mock
+
+import toposort
+
+from pglifecycle import constants, generate_dump
+
+
+class LoadYAMLTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.path = pathlib.Path(self.temp_dir.name) / 'definition.yaml'
+
+    def test_keeps_every_definition_key(self):
+        self.path.write_text('\n'.join([
+            'name: example',
+            'schema: public',
+            'owner: postgres',
+            'authorization: postgres',
+            'create: false',
+            'sql: CREATE TABLE public.example (id INTEGER);',
+            'tablespace: fast',
+            'comment: An example',
+            'comments:',
+            '  - COMMENT ON COLUMN public.example.id IS $$Id$$;',
+            'dependencies:',
+            '  - schema: public',
+            'grants:',
+            '  roles: [admin]',
+            'revocations:',
+            '  roles: [reader]',
+            'settings:',
+            '  - name: search_path',
+            '    type: VALUE',
+            '    value: public',
+            'options:',
+            '  host: localhost',
+            'owned_by: public.example.id',
+            'password: secret',
+            'fdw: postgres_fdw',
+            'handler: fdw_handler',
+            'validator: fdw_validator',
+            'server: remote',
+            'user: postgres',
+            'type: postgres',
+            'version: "12"',
+            'types:',
+            '  - name: example_type',
+            'acls: []',
+            'check constraints: []',
+            'constraints: []',
+            'defaults: []',
+            'foreign keys: []',
+            'indexes: []',
+            'rules: []',
+            'triggers: []',
+            'unused: value']) + '\n')
+        definition = generate_dump._load_yaml(str(self.path))
+        self.assertEqual(
+            set(definition.keys()),
+            {'name', 'schema', 'owner', 'authorization', 'create', 'sql',
+             'tablespace', 'comment', 'comments', 'dependencies', 'grants',
+             'revocations', 'settings', 'options', 'owned_by', 'password',
+             'fdw', 'handler', 'validator', 'server', 'user', 'type',
+             'version', 'types', 'unused'}.union(
+                 generate_dump.constants.TABLE_KEYS.values()))
+        self.assertEqual(definition['dependencies'], [{'schema': 'public'}])
+        self.assertEqual(definition['options'], {'host': 'localhost'})
+
+
+class ParseCacheTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        base_path = pathlib.Path(self.temp_dir.name)
+        env = mock.patch.dict(
+            os.environ, {'XDG_CACHE_HOME': str(base_path / 'cache')})
+        env.start()
+        self.addCleanup(env.stop)
+        self.project_path = base_path / 'project'
+        self.project_path.mkdir()
+        (self.project_path / 'project.yaml').write_text(
+            'name: test\nencoding: UTF8\nstdstrings: true\n'
+            'extensions: []\nlanguages: []\nsuperuser: postgres\n')
+        self.path = str(self.project_path / 'definition.yaml')
+        self.write('name: foo\n')
+
+    def generate(self, cache=True):
+        return generate_dump.Generate(argparse.Namespace(
+            project=str(self.project_path), cache=cache, jobs=1))
+
+    def write(self, content, mtime_ns=None):
+        pathlib.Path(self.path).write_text(content)
+        if mtime_ns is not None:
+            os.utime(self.path, ns=(mtime_ns, mtime_ns))
+
+    def prime(self):
+        obj = self.generate()
+        self.assertEqual(obj._read_files([self.path]), [{'name': 'foo'}])
+        obj._save_cache()
+        self.assertTrue(obj._cache_path.exists())
+
+    def test_hit(self):
+        self.prime()
+        obj = self.generate()
+        with mock.patch.object(generate_dump, '_load_yaml') as load_yaml:
+            self.assertEqual(obj._read_files([self.path]), [{'name': 'foo'}])
+        load_yaml.assert_not_called()
+
+    def test_miss_after_size_change(self):
+        self.prime()
+        self.write('name: foobar\n')
+        self.assertEqual(
+            self.generate()._read_files([self.path]), [{'name': 'foobar'}])
+
+    def test_miss_after_mtime_change(self):
+        self.prime()
+        mtime_ns = os.stat(self.path).st_mtime_ns
+        self.write('name: bar\n', mtime_ns + 1000000000)
+        self.assertEqual(
+            self.generate()._read_files([self.path]), [{'name': 'bar'}])
+
+    def test_corrupt_cache(self):
+        self.prime()
+        cache_path = self.generate()._cache_path
+        for content in [b'not a pickle', pickle.dumps(['files']),
+                        pickle.dumps({'fingerprint': 'other', 'files': {}}),
+                        pickle.dumps({'fingerprint':
+                                      generate_dump._cache_fingerprint(),
+                                      'files': None})]:
+            cache_path.write_bytes(content)
+            obj = self.generate()
+            self.assertEqual(obj._cached, {})
+            self.assertEqual(
+                obj._read_files([self.path]), [{'name': 'foo'}])
+
+    def test_disabled_by_default(self):
+        obj = generate_dump.Generate(
+            argparse.Namespace(project=str(self.project_path)))
+        obj._read_files([self.path])
+        obj._save_cache()
+        self.assertFalse(obj._cache_path.exists())
+
+    def test_disabled_skips_bookkeeping(self):
+        obj = self.generate(cache=False)
+        with mock.patch.object(generate_dump.os, 'stat') as stat:
+            self.assertEqual(obj._read_files([self.path]), [{'name': 'foo'}])
+        stat.assert_not_called()
+        self.assertEqual(obj._cache, {})
+        self.assertFalse(obj._cache_changed)
+
+
+class ToposortTestCase(unittest.TestCase):
+
+    def test_matches_toposort_flatten(self):
+        dependencies = {
+            2: {1}, 3: {1, 2}, 4: {1}, 5: {3, 4}, 6: set(), 7: {6, 2}}
+        order, cyclic = generate_dump._toposort(dependencies)
+        self.assertEqual(
+            order, toposort.toposort_flatten(dependencies, sort=True))
+        self.assertEqual(order, [1, 6, 2, 4, 3, 7, 5])
+        self.assertEqual(cyclic, set())
+
+    def test_sorts_within_a_level(self):
+        order, _cyclic = generate_dump._toposort(
+            {30: set(), 10: set(), 20: set(), 5: {30, 10}})
+        self.assertEqual(order, [10, 20, 30, 5])
+
+    def test_dependency_only_nodes(self):
+        dependencies = {3: {1, 2}, 4: {3}}
+        order, cyclic = generate_dump._toposort(dependencies)
+        self.assertEqual(order, [1, 2, 3, 4])
+        self.assertEqual(
+            order, toposort.toposort_flatten(dependencies, sort=True))
+        self.assertEqual(cyclic, set())
+
+    def test_cycle_reports_only_members(self):
+        order, cyclic = generate_dump._toposort(
+            {1: {2}, 2: {1}, 3: {1}, 4: {3}, 5: set(), 6: {5}})
+        self.assertEqual(order, [5, 6])
+        self.assertEqual(cyclic, {1, 2})
+
+    def test_cycle_keeps_nodes_between_cycles(self):
+        order, cyclic = generate_dump._toposort(
+            {1: {2}, 2: {1}, 3: {1}, 4: {3, 5}, 5: {4}, 6: {4}})
+        self.assertEqual(order, [])
+        self.assertEqual(cyclic, {1, 2, 3, 4, 5})
+
+
+class RunTestCase(unittest.TestCase):
+
+    def test_run_without_jobs_argument(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            (pathlib.Path(temp_dir) / 'project.yaml').write_text(
+                'name: test\nencoding: UTF8\nstdstrings: true\n'
+                'extensions: []\nlanguages: []\nsuperuser: postgres\n')
+            obj = generate_dump.Generate(argparse.Namespace(project=temp_dir))
+            with mock.patch.object(obj, '_run') as run:
+                obj.run()
+            run.assert_called_once_with()
+            self.assertIsNone(obj._executor)
+
+
+class VerifyTestCase(unittest.TestCase):
+
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.project_path = temp_dir.name
+        (pathlib.Path(self.project_path) / 'project.yaml').write_text(
+            'name: test\nencoding: UTF8\nstdstrings: true\n'
+            'extensions: []\nlanguages: []\nsuperuser: postgres\n')
+
+    def generate(self, **kwargs):
+        obj = generate_dump.Generate(argparse.Namespace(
+            project=self.project_path, **kwargs))
+        self.parent_id, self.child_id = obj._dump_id + 1, obj._dump_id + 2
+        for dump_id, name in [(self.parent_id, 'parent'),
+                              (self.child_id, 'child')]:
+            obj._store_item(generate_dump._Item(
+                constants.TABLE, 'public', name, dump_id,
+                {'sql': 'CREATE TABLE {}();'.format(name)}))
+        obj._dependencies = {
+            self.parent_id: set(), self.child_id: {self.parent_id}}
+        # Process the dependent object first
+        obj._sort_dependencies = mock.Mock(
+            return_value=[self.child_id, self.parent_id])
+        return obj
+
+    def test_unverified_by_default(self):
+        obj = self.generate()
+        # pgdumplib rejects the entry rather than the verification check
+        with self.assertRaises(ValueError):
+            obj._process_inventory()
+
+    def test_verify_raises_for_unprocessed_dependency(self):
+        obj = self.generate(verify=True)
+        with self.assertLogs(generate_dump.LOGGER, 'ERROR'):
+            with self.assertRaises(RuntimeError):
+                obj._process_inventory()
+        self.assertEqual(obj._processed, set())
+
+
+class LookupRoleEntryTestCase(unittest.TestCase):
+
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        (pathlib.Path(temp_dir.name) / 'project.yaml').write_text(
+            'name: test\nencoding: UTF8\nstdstrings: true\n'
+            'extensions: []\nlanguages: []\nsuperuser: postgres\n')
+        self.generate = generate_dump.Generate(argparse.Namespace(
+            project=temp_dir.name, suppress_warnings=False))
+        self.item = self.generate._store_item(generate_dump._Item(
+            constants.ROLE, constants.ROLE, 'reader', 100, {}))
+
+    def test_hit_is_memoized(self):
+        self.assertIs(self.generate._lookup_role_entry('reader'), self.item)
+        del self.generate._inventory[constants.ROLE, constants.ROLE, 'reader']
+        self.assertIs(self.generate._lookup_role_entry('reader'), self.item)
+
+    def test_miss_warns_on_every_lookup(self):
+        with self.assertLogs(generate_dump.LOGGER, 'WARNING') as log:
+            self.assertIsNone(self.generate._lookup_role_entry('writer'))
+            self.assertIsNone(self.generate._lookup_role_entry('writer'))
+        self.assertEqual(len(log.records), 2)
+        self.assertNotIn('writer', self.generate._role_entries)
@@ -0,0 +1,147 @@
+import collections
+import unittest
+
+from pgdumplib import dump
+
+from pglifecycle import constants, generate_project
+
+
+class FunctionFilenameTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.filenames = collections.defaultdict(dict)
+
+    def filename(self, tag, namespace='public'):
+        return generate_project._function_filename(
+            tag, self.filenames[constants.FUNCTION, namespace])
+
+    def test_single_function(self):
+        self.assertEqual(self.filename('foo()'), 'foo')
+
+    def test_argument_count_in_filename(self):
+        self.assertEqual(self.filename('foo(integer)'), 'foo')
+        self.assertEqual(self.filename('foo(integer, text)'), 'foo-1')
+        self.assertEqual(
+            self.filename('foo(integer, text, boolean)'), 'foo-2')
+
+    def test_overloads_in_one_schema(self):
+        self.assertEqual(self.filename('foo(integer)'), 'foo')
+        self.assertEqual(self.filename('foo(text)'), 'foo_1')
+        self.assertEqual(self.filename('foo(integer, text)'), 'foo-1')
+        self.assertEqual(self.filename('foo(bigint)'), 'foo_2')
+        self.assertEqual(self.filename('foo(text, text)'), 'foo-1_1')
+
+    def test_same_name_in_two_schemas(self):
+        self.assertEqual(self.filename('foo(integer)', 'public'), 'foo')
+        self.assertEqual(self.filename('foo(integer)', 'other'), 'foo')
+        self.assertEqual(self.filename('foo(text)', 'other'), 'foo_1')
+        self.assertEqual(self.filename('foo(text)', 'public'), 'foo_1')
+
+    def test_suffix_numbering(self):
+        self.assertEqual(
+            [self.filename('foo(t{})'.format(i)) for i in range(12)],
+            ['foo'] + ['foo_{}'.format(i) for i in range(1, 12)])
+
+    def test_suffix_does_not_collide_with_function_name(self):
+        self.assertEqual(self.filename('foo(integer)'), 'foo')
+        self.assertEqual(self.filename('foo(text)'), 'foo_1')
+        self.assertEqual(self.filename('foo_1()'), 'foo_1_1')
+        self.assertEqual(self.filename('foo(bigint)'), 'foo_2')
+
+
+class RemoveNullValuesTestCase(unittest.TestCase):
+
+    def test_removes_none_and_empty_values(self):
+        self.assertEqual(
+            generate_project._remove_null_values(
+                {'a': None, 'b': '', 'c': [], 'd': {}, 'e': 'value'}),
+            {'e': 'value'})
+
+    def test_keeps_falsey_non_none_values(self):
+        self.assertEqual(
+            generate_project._remove_null_values(
+                {'zero': 0, 'false': False, 'float': 0.0,
+                 'nested': {'zero': 0, 'false': False, 'none': None}}),
+            {'zero': 0, 'false': False, 'float': 0.0,
+             'nested': {'zero': 0, 'false': False}})
+
+    def test_nested_dicts(self):
+        self.assertEqual(
+            generate_project._remove_null_values(
+                {'a': {'b': {'c': None, 'd': 1}, 'e': ''}}),
+            {'a': {'b': {'d': 1}}})
+
+    def test_removes_dicts_emptied_by_pruning(self):
+        self.assertEqual(
+            generate_project._remove_null_values(
+                {'a': {'b': {'c': None}, 'd': {'e': []}}, 'f': 1}),
+            {'f': 1})
+
+    def test_nested_dicts_in_lists(self):
+        self.assertEqual(
+            generate_project._remove_null_values(
+                {'columns': [
+                    {'name': 'id', 'default': None, 'nullable': False},
+                    {'name': 'value', 'options': {'a': None, 'b': 2}},
+                    'literal', 0]}),
+            {'columns': [
+                {'name': 'id', 'nullable': False},
+                {'name': 'value', 'options': {'b': 2}},
+                'literal', 0]})
+
+    def test_keeps_dicts_in_lists_emptied_by_pruning(self):
+        self.assertEqual(
+            generate_project._remove_null_values(
+                {'items': [{'a': None}, {'b': {'c': ''}}]}),
+            {'items': [{}, {}]})
+
+    def test_keeps_list_emptied_of_values(self):
+        self.assertEqual(
+            generate_project._remove_null_values({'items': [None, '']}),
+            {'items': [None, '']})
+
+
+class FormatterNameTestCase(unittest.TestCase):
+
+    def test_object_types_with_formatters(self):
+        for object_type, expectation in [
+                (constants.OPERATOR, 'operator'),
+                (constants.SCHEMA, 'schema'),
+                (constants.SEQUENCE, 'sequence'),
+                (constants.SERVER, 'server'),
+                (constants.TABLE, 'table'),
+                (constants.VIEW, 'view')]:
+            self.assertEqual(
+                generate_project._formatter_name(object_type), expectation)
+
+    def test_other_object_types_use_generic(self):
+        for object_type in [constants.FUNCTION, constants.OPERATOR_CLASS,
+                            'ENTRIES', 'FILTER', 'PROCESSED']:
+            self.assertEqual(
+                generate_project._formatter_name(object_type), 'generic')
+
+
+class RunTaskTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.entries = [
+            dump.Entry(dump_id, tag='t{}'.format(dump_id),
+                       desc=constants.TABLE, namespace='public')
+            for dump_id in range(1, 6)]
+        self.structure = generate_project.Structure(self.entries)
+        self.structure._mark_processed(1)
+        self.addCleanup(setattr, generate_project, '_STRUCTURE', None)
+        generate_project._init_worker(self.structure, frozenset())
+
+    def test_returns_only_the_dump_ids_the_task_marked(self):
+        def task(structure, entry, formatter, omit):
+            structure._mark_processed(entry.dump_id)
+            structure._mark_processed(5)
+            return formatter
+
+        self.assertEqual(
+            generate_project._run_task(self.entries[2], 'table', task),
+            ('table', [3, 5]))
+        self.assertEqual(
+            generate_project._run_task(self.entries[3], 'table', task),
+            ('table', [4, 5]))
@@ -0,0 +1,59 @@
+import os
+import pathlib
+import tempfile
+import unittest
+
+from pglifecycle import constants, storage
+
+
+class CleanupTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.path = pathlib.Path(self.temp_dir.name)
+        self.tables = self.path / constants.PATHS[constants.TABLE]
+
+    def touch(self, *parts):
+        path = self.tables.joinpath(*parts)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.touch()
+        return path
+
+    def test_removes_nested_empty_directories(self):
+        (self.tables / 'public' / 'empty' / 'deeper').mkdir(parents=True)
+        table = self.touch('other', 'table.yaml')
+        storage.remove_empty_directories(self.path)
+        self.assertFalse((self.tables / 'public').exists())
+        self.assertTrue(table.exists())
+
+    def test_removes_object_directory_left_empty(self):
+        (self.tables / 'public' / 'empty').mkdir(parents=True)
+        storage.remove_empty_directories(self.path)
+        self.assertFalse(self.tables.exists())
+
+    def test_removes_unneeded_gitkeeps(self):
+        needed = self.touch('empty', '.gitkeep')
+        unneeded = self.touch('public', '.gitkeep')
+        self.touch('public', 'table.yaml')
+        with_subdir = self.touch('.gitkeep')
+        storage.remove_unneeded_gitkeeps(self.path)
+        self.assertTrue(needed.exists())
+        self.assertFalse(unneeded.exists())
+        self.assertFalse(with_subdir.exists())
+        self.assertTrue((self.tables / 'public' / 'table.yaml').exists())
+
+    def test_gitkeep_keeps_directory(self):
+        gitkeep = self.touch('public', '.gitkeep')
+        storage.cleanup(self.path, gitkeeps=True, empty_directories=True)
+        self.assertTrue(gitkeep.exists())
+
+    def test_directory_symlink_is_not_followed(self):
+        target = pathlib.Path(self.temp_dir.name) / 'target'
+        (target / 'empty').mkdir(parents=True)
+        link_parent = self.tables / 'public'
+        link_parent.mkdir(parents=True)
+        os.symlink(target, link_parent / 'link', target_is_directory=True)
+        storage.remove_empty_directories(self.path)
+        self.assertTrue((link_parent / 'link').is_symlink())
+        self.assertTrue((target / 'empty').is_dir())